@@ -1,7 +1,10 @@
-from dataclasses import dataclass
+import zlib
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Union
+from typing import List, Optional, Union
+
+from utils.html_converter import ConverterPool
 
 
 class SourceType(Enum):
@@ -69,10 +72,15 @@ class DateRange:
             raise ValueError("La fecha de inicio debe ser anterior o igual a la fecha de fin")
 
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     """Representa un artículo de una fuente de noticias"""
 
+    # Modos de memoria del cuerpo, ver compact
+    FULL = "FULL"  # body y body_html como texto
+    COMPRESSED = "COMPRESSED"  # solo body_html comprimido, body se obtiene al leerlo
+    NO_HTML = "NO_HTML"  # solo body, sin body_html
+
     newspaper: NewspaperType
     url: str  # URL completa del artículo
     title: Optional[str] = None  # Título del artículo
@@ -80,8 +88,55 @@ class Article:
     date: Optional[datetime] = None  # Fecha de publicación del artículo
     tag: Optional[str] = None  # Etiqueta del artículo
     drophead: Optional[str] = None  # Cabecera del artículo
-    body: Optional[str] = None  # Cuerpo del artículo
-    body_html: Optional[str] = None  # Cuerpo del artículo en HTML
+    _body: Optional[str] = None  # Cuerpo del artículo
+    _body_html: Union[str, bytes, None] = None  # Cuerpo del artículo en HTML, bytes con zlib si está comprimido
+    _html_dropped: bool = field(default=False, repr=False)  # body_html descartado por NO_HTML, no que el artículo no lo tenga
 
-    def __post_init__(self):
-        pass
+    @property
+    def body(self) -> Optional[str]:
+        if self._body is None and isinstance(self._body_html, bytes):
+            # No se guarda, para que el artículo siga ocupando solo el HTML comprimido
+            return ConverterPool.get().handle(self.body_html).strip()
+
+        return self._body
+
+    @body.setter
+    def body(self, body: Optional[str]) -> None:
+        self._body = body
+
+    @property
+    def body_html(self) -> Optional[str]:
+        if isinstance(self._body_html, bytes):
+            return zlib.decompress(self._body_html).decode("utf-8")
+
+        return self._body_html
+
+    @property
+    def html_dropped(self) -> bool:
+        return self._html_dropped
+
+    @body_html.setter
+    def body_html(self, body_html: Optional[str]) -> None:
+        self._body_html = body_html
+
+    def compact(self, mode: str) -> "Article":
+        """Reducir la memoria del cuerpo según el modo (FULL, COMPRESSED o NO_HTML)"""
+        if mode == Article.COMPRESSED and isinstance(self._body_html, str):
+            self._body_html = zlib.compress(self._body_html.encode("utf-8"))
+            self._body = None
+        elif mode == Article.NO_HTML:
+            self._body = self.body
+            self._body_html = None
+            self._html_dropped = True
+
+        return self
+
+
+@dataclass
+class PageProbe:
+    """Datos de una página de listado ya consultada"""
+
+    url: str  # URL de la página de listado
+    first_date: Optional[datetime] = None  # Fecha del primer artículo de la página
+    last_date: Optional[datetime] = None  # Fecha del último artículo de la página
+    article_urls: List[str] = field(default_factory=list)  # URLs de los artículos de la página
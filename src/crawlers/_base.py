@@ -1,11 +1,19 @@
+import asyncio
+import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
-
-from html2text import HTML2Text
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 from core.models import Article, DateRange, NewspaperType
+from services.checkpoint_store import CheckpointStore
+from services.response_cache import ResponseCache
+from utils.file_utils import FileUtils
+from utils.html_converter import ConverterPool
 from utils.logger import Logger
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 class BaseCrawler(ABC):
     """Base crawler"""
@@ -15,40 +23,65 @@ class BaseCrawler(ABC):
             self.NAME = NewspaperType(config.get("name"))
             self.BASE_URLS = config.get("base_urls")
             self.REQUESTS_CONFIG = config.get("requests_config")
+            self.CACHE_CONFIG = config.get("cache_config")
+            self.PARALLEL_PROBES = int(self.REQUESTS_CONFIG.get("parallel_probes", 1))
         except ValueError as e:
             raise ValueError("Invalid crawler main configuration: " + str(e))
 
         self.date_range = date_range
 
-        # Configure HTML parser
-        self.HTML_PARSER = HTML2Text()
-        self.HTML_PARSER.ignore_links = True
-        self.HTML_PARSER.ignore_images = True
-        self.HTML_PARSER.body_width = 0
-        self.HTML_PARSER.skip_internal_links = True
-        self.HTML_PARSER.unicode_snob = True
-
-        # Desactive a Markdown format
-        self.HTML_PARSER.bold = False
-        self.HTML_PARSER.italic = False
-        self.HTML_PARSER.underline = False
-        self.HTML_PARSER.mark_code = False
-        self.HTML_PARSER.ignore_emphasis = True
-        self.HTML_PARSER.single_line_break = True
+        # Optional filter of the article urls before fetching them, e.g. the ones already saved
+        self.url_filter: Callable[[List[str]], Awaitable[List[str]]] | None = None
+
+        # Configured HTML to text converters, one for each parse running at once
+        self.CONVERTER_POOL = ConverterPool.get()
+
+        # Memory mode of the kept articles, set by the storage
+        self.article_mode = Article.FULL
+
+        # Progress of the crawl, only the resumable crawlers have it
+        self.CHECKPOINTS: CheckpointStore | None = None
+
+    def _create_response_cache(self) -> ResponseCache | None:
+        """Create the on-disk response cache of the newspaper, only when the crawler has cache_config"""
+        if self.CACHE_CONFIG is None:
+            return None
+
+        folder_path = FileUtils.create_folder("cache")
+        return ResponseCache(
+            db_path=os.path.join(folder_path, f"responses_{self.NAME.value}.sqlite"),
+            ttl_rules={
+                ResponseCache.PAGE: self.CACHE_CONFIG.get("pages_ttl", 3600),
+                ResponseCache.ARTICLE: self.CACHE_CONFIG.get("articles_ttl"),
+            },
+            max_size_mb=self.CACHE_CONFIG.get("max_size_mb", 1024),
+        )
 
     async def crawl(self) -> List[Article]:
         """Crawl the newspaper"""
         Logger.info(prefix="SPIDER", message=f"Obteniendo noticias de {self.NAME.value}")
 
+        all_pages = await self._generate_all_pages()
+        articles = await self.get_articles(all_pages)
+
+        return articles
+
+    async def crawl_stream(self) -> AsyncIterator[Article]:
+        """Crawl the newspaper yielding the articles as soon as they are parsed"""
+        Logger.info(prefix="SPIDER", message=f"Obteniendo noticias de {self.NAME.value}")
+
+        all_pages = await self._generate_all_pages()
+        async for article in self.stream_articles(all_pages):
+            yield article
+
+    async def _generate_all_pages(self) -> List[str]:
         all_pages = []
 
         for base_url in self.BASE_URLS:
             pages = await self.generate_pages(base_url)
             all_pages.extend(pages)
 
-        articles = await self.get_articles(all_pages)
-
-        return articles
+        return all_pages
 
     @abstractmethod
     async def generate_pages(self, base_url: str) -> List[str]:
@@ -59,3 +92,74 @@ class BaseCrawler(ABC):
     async def get_articles(self, pages: List[str]) -> List[Article]:
         """Get the list of articles from the pages"""
         pass
+
+    async def stream_articles(self, pages: List[str]) -> AsyncIterator[Article]:
+        """Yield the articles from the pages, by default all of them at once from get_articles"""
+        for article in await self.get_articles(pages):
+            yield article
+
+    def on_articles_saved(self, articles: List[Article]) -> None:
+        """Called after a chunk of the crawled articles is saved, by default there is nothing to do"""
+        pass
+
+    def on_crawl_saved(self) -> None:
+        """Called after all the crawled articles are saved, by default there is nothing to do"""
+        pass
+
+    def _keep_article(self, article: Article | None) -> bool:
+        """Drop the missing articles and, unless disabled, the ones outside the date range"""
+        if article is None:
+            return False
+
+        if self.REQUESTS_CONFIG.get("filter_inside_date_range") is not None and self.REQUESTS_CONFIG.get("filter_inside_date_range") is False:
+            return True
+
+        return article.date >= self.date_range.start_date and article.date <= self.date_range.end_date
+
+    def _is_halved(self, start: int, end: int, new_start: int, new_end: int) -> bool:
+        """Check if a search step at least halved the interval, otherwise the next step bisects"""
+        return (new_end - new_start) * 2 <= end - start
+
+    async def _search_parallel(self, start: int, end: int, probe_date: Callable[[int], Awaitable[Optional[datetime]]], compare: Callable[[datetime], int], pick_last: bool, estimate: Callable[[int, int], int]) -> Tuple[Optional[int], int, int]:
+        """Probe PARALLEL_PROBES evenly spaced positions at once, plus the estimated one, narrowing the interval until one of them matches.
+        compare returns 0 for a match, < 0 when the target is before the position and > 0 when it is after"""
+        while start < end - 1:
+            step = (end - start) / (self.PARALLEL_PROBES + 1)
+            positions = {start + round(step * i) for i in range(1, self.PARALLEL_PROBES + 1)}
+            positions.add(estimate(start, end))
+            positions = sorted(positions - {start, end})
+
+            dates = await asyncio.gather(*[probe_date(position) for position in positions])
+            probed = [(position, compare(date)) for position, date in zip(positions, dates) if date is not None]
+            if len(probed) == 0:
+                # Every probe failed, let the caller fall back to the sequential search
+                return None, start, end
+
+            matches = [position for position, order in probed if order == 0]
+            if len(matches) > 0:
+                return (matches[-1] if pick_last else matches[0]), start, end
+
+            start = max([start] + [position for position, order in probed if order > 0])
+            end = min([end] + [position for position, order in probed if order < 0])
+
+        return None, start, end
+
+    async def _run_continuously(self, items: Iterable[T], fn: Callable[[T], Awaitable[R]], max_pending: int) -> AsyncIterator[R]:
+        """Run fn over the items keeping max_pending tasks in flight, yielding the results as they complete"""
+        pending = set()
+
+        try:
+            for item in items:
+                pending.add(asyncio.ensure_future(fn(item)))
+                if len(pending) >= max_pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+
+            while len(pending) > 0:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -3,6 +3,7 @@ from datetime import timedelta
 from typing import List, Optional
 from datetime import datetime
 from bs4 import BeautifulSoup
+from bs4.element import Tag
 
 from crawlers.generics.static_website import StaticWebsiteCrawler
 
@@ -31,8 +32,7 @@ class CooperativaCrawler(StaticWebsiteCrawler):
         return pages
 
     # TODO: ENCAPSULATION OF GET DATA FROM HTML
-    def _get_date(self, soup: BeautifulSoup) -> Optional[datetime]:
-        date_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("date").get("selectors"))
+    def _get_date(self, soup: BeautifulSoup, date_elem: Optional[Tag]) -> Optional[datetime]:
         if date_elem is not None:
             date_str = date_elem.get_text(strip=True)
             date_split = date_str.split(" ")
@@ -46,8 +46,7 @@ class CooperativaCrawler(StaticWebsiteCrawler):
 
         return None
     
-    def _get_tag(self, soup: BeautifulSoup) -> Optional[str]:
-        tag_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("tag").get("selectors"))
+    def _get_tag(self, soup: BeautifulSoup, tag_elem: Optional[Tag]) -> Optional[str]:
         if tag_elem is not None:
             return tag_elem.get_text(strip=True)
         
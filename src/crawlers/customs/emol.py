@@ -1,9 +1,8 @@
 import asyncio
 import math
 import re
-import time
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional
 
 from core.models import Article
 from crawlers.generics.api import ApiCrawler
@@ -17,12 +16,19 @@ class EmolCrawler(ApiCrawler):
     def __init__(self, config, date_range):
         super().__init__(config, date_range)
 
+        # Dates of the articles already probed, by position
+        self._paper_dates: Dict[int, datetime] = {}
+
     # TODO: GENERATE PAGES
     async def generate_pages(self, base_url) -> List[str]:
         """Generate the list of pages to crawl"""
         total_papers = await self._get_total_articles(base_url)
-        start_paper = await self._get_start_paper(base_url, self.date_range.start_date, 0, total_papers - 1)
-        end_paper = await self._get_end_paper(base_url, self.date_range.end_date, 0, start_paper)
+        if self.PARALLEL_PROBES > 1:
+            tasks = [self._get_start_paper_parallel(base_url, self.date_range.start_date, 0, total_papers - 1), self._get_end_paper_parallel(base_url, self.date_range.end_date, 0, total_papers - 1)]
+            start_paper, end_paper = await asyncio.gather(*tasks)
+        else:
+            start_paper = await self._get_start_paper(base_url, self.date_range.start_date, 0, total_papers - 1)
+            end_paper = await self._get_end_paper(base_url, self.date_range.end_date, 0, start_paper)
         if end_paper > start_paper:
             start_paper, end_paper = end_paper, start_paper
 
@@ -45,135 +51,158 @@ class EmolCrawler(ApiCrawler):
         if status is None or status == 404:
             return 0
 
+        # The newest article is the first bound of the search
+        article_list = self._get_nested_safe(data_json, self.ARTICLES_LIST_CONFIG.get("path"))
+        if article_list is not None and len(article_list) > 0:
+            self._paper_dates[0] = self._get_date(article_list[0])
+
         total_articles = self._get_nested_safe(data_json, self.PAGINATION.get("total_articles").get("path"))
         if total_articles is None:
             return 0
 
         return total_articles
 
-    async def _get_start_paper(self, base_url: str, start_date: datetime, start_article: int, end_article: int) -> int:
+    async def _get_start_paper(self, base_url: str, start_date: datetime, start_article: int, end_article: int, interpolate: bool = True) -> int:
         """Get the start paper to crawl"""
         if start_article >= end_article - 1:
             return end_article
 
-        mid_article = math.floor((start_article + end_article) / 2)
+        mid_article = self._get_search_paper(start_date - timedelta(days=1), start_article, end_article, interpolate)
 
         url = re.sub(r"\(\\size\+\)", str(1), base_url)  # set size
         url = re.sub(r"\(\\from\+\)", str(mid_article), url)  # set from
 
         data_json, status = await self.FETCHER.fetch_json(url=url)
         if status is None or status == 404:
-            return await self._get_start_paper(base_url, start_date, start_article + 1, end_article)
+            return await self._get_start_paper(base_url, start_date, start_article + 1, end_article, False)
 
         # Get articles
         article_list = self._get_nested_safe(data_json, self.ARTICLES_LIST_CONFIG.get("path"))
-        if article_list is None or len(article_list) == 0:
+        article_date = self._get_date(article_list[0]) if article_list is not None and len(article_list) > 0 else None
+        if article_date is None:
             Logger.error("NETWORK", f"Don't found any articles for URL: {url}")
             await asyncio.sleep(self.FETCHER.RETRY_DELAY)
-            return await self._get_start_paper(base_url, start_date, start_article + 1, end_article)
-
-        # Get date from article
-        article = article_list[0]
-        date_str = self._get_attribute_safe(article, self.ARTICLE_CONFIG.get("date").get("paths"))
-
-        if self.ARTICLE_CONFIG.get("date").get("formats") is not None:
-            for date_format in self.ARTICLE_CONFIG.get("date").get("formats"):
-                try:
-                    if "T" in date_format:
-                        new_date_format = date_format.split("T")[0]
-                        new_date_str = date_str.split("T")[0]
-                        article_date = datetime.strptime(new_date_str, new_date_format)
-                    else:
-                        article_date = datetime.strptime(date_str, date_format)
-                    break
-                except Exception:
-                    pass
-        else:
-            article_date = datetime.strptime(date_str)
+            return await self._get_start_paper(base_url, start_date, start_article + 1, end_article, False)
+        self._paper_dates[mid_article] = article_date
 
         # Binary search logic
         diff = DateUtils.diff_days(start_date, article_date)
         if diff == 1:
             return mid_article
         elif diff > 1:
-            return await self._get_start_paper(base_url, start_date, start_article, mid_article)
+            return await self._get_start_paper(base_url, start_date, start_article, mid_article, self._is_halved(start_article, end_article, start_article, mid_article))
         else:
-            return await self._get_start_paper(base_url, start_date, mid_article, end_article)
+            return await self._get_start_paper(base_url, start_date, mid_article, end_article, self._is_halved(start_article, end_article, mid_article, end_article))
 
-    async def _get_end_paper(self, base_url: str, end_date: datetime, start_article: int, end_article: int) -> int:
+    async def _get_end_paper(self, base_url: str, end_date: datetime, start_article: int, end_article: int, interpolate: bool = True) -> int:
         """Get the end paper to crawl"""
         if start_article >= end_article - 1:
             return start_article
 
-        mid_article = math.floor((start_article + end_article) / 2)
+        mid_article = self._get_search_paper(end_date + timedelta(days=1), start_article, end_article, interpolate)
 
         url = re.sub(r"\(\\size\+\)", str(1), base_url)  # set size
         url = re.sub(r"\(\\from\+\)", str(mid_article), url)  # set from
 
         data_json, status = await self.FETCHER.fetch_json(url=url)
         if status is None or status == 404:
-            return await self._get_end_paper(base_url, end_date, start_article, end_article - 1)
+            return await self._get_end_paper(base_url, end_date, start_article, end_article - 1, False)
 
         # Get articles
         article_list = self._get_nested_safe(data_json, self.ARTICLES_LIST_CONFIG.get("path"))
-        if article_list is None or len(article_list) == 0:
+        article_date = self._get_date(article_list[0]) if article_list is not None and len(article_list) > 0 else None
+        if article_date is None:
             Logger.error("NETWORK", f"Don't found any articles for URL: {url}")
             await asyncio.sleep(self.FETCHER.RETRY_DELAY)
-            return await self._get_end_paper(base_url, end_date, start_article, end_article - 1)
-
-        # Get date from article
-        article = article_list[0]
-        date_str = self._get_attribute_safe(article, self.ARTICLE_CONFIG.get("date").get("paths"))
-
-        if self.ARTICLE_CONFIG.get("date").get("formats") is not None:
-            for date_format in self.ARTICLE_CONFIG.get("date").get("formats"):
-                try:
-                    if "T" in date_format:
-                        new_date_format = date_format.split("T")[0]
-                        new_date_str = date_str.split("T")[0]
-                        article_date = datetime.strptime(new_date_str, new_date_format)
-                    else:
-                        article_date = datetime.strptime(date_str, date_format)
-                    break
-                except Exception:
-                    pass
-        else:
-            article_date = datetime.strptime(date_str)
+            return await self._get_end_paper(base_url, end_date, start_article, end_article - 1, False)
+        self._paper_dates[mid_article] = article_date
 
         # Binary search logic
         diff = DateUtils.diff_days(end_date, article_date)
         if diff == -1:
             return mid_article
         elif diff < -1:
-            return await self._get_end_paper(base_url, end_date, mid_article, end_article)
+            return await self._get_end_paper(base_url, end_date, mid_article, end_article, self._is_halved(start_article, end_article, mid_article, end_article))
         else:
-            return await self._get_end_paper(base_url, end_date, start_article, mid_article)
+            return await self._get_end_paper(base_url, end_date, start_article, mid_article, self._is_halved(start_article, end_article, start_article, mid_article))
 
-    # TODO: GET ARTICLES
-    async def get_articles(self, pages: List[str]) -> List[Article]:
-        """Get the list of articles from the url"""
-        BLOCK_SIZE = int(self.REQUESTS_CONFIG.get("requests_per_minute") / 60)
+    async def _get_start_paper_parallel(self, base_url: str, start_date: datetime, start_article: int, end_article: int) -> int:
+        """Get the start paper to crawl probing several papers at once"""
+
+        def compare(article_date: datetime) -> int:
+            diff = DateUtils.diff_days(start_date, article_date)
+            return 0 if diff == 1 else -1 if diff > 1 else 1
+
+        paper, start_article, end_article = await self._search_parallel(start_article, end_article, lambda article: self._probe_paper_date(base_url, article), compare, False, lambda start, end: self._get_search_paper(start_date - timedelta(days=1), start, end, True))
+        if paper is not None:
+            return paper
+        if start_article >= end_article - 1:
+            return end_article
+
+        return await self._get_start_paper(base_url, start_date, start_article, end_article, False)
+
+    async def _get_end_paper_parallel(self, base_url: str, end_date: datetime, start_article: int, end_article: int) -> int:
+        """Get the end paper to crawl probing several papers at once"""
 
-        all_articles = []
-        for i in range(0, len(pages), BLOCK_SIZE):
-            start_time = time.time()
-            articles = await self._get_block_articles(pages[i : i + BLOCK_SIZE])
-            if self.REQUESTS_CONFIG.get("filter_inside_date_range") is not None and self.REQUESTS_CONFIG.get("filter_inside_date_range") is False:
-                all_articles.extend(filter(lambda a: (a is not None), articles))
-            else:
-                all_articles.extend(filter(lambda a: (a is not None) and (a.date >= self.date_range.start_date and a.date <= self.date_range.end_date), articles))
+        def compare(article_date: datetime) -> int:
+            diff = DateUtils.diff_days(end_date, article_date)
+            return 0 if diff == -1 else 1 if diff < -1 else -1
 
-            await self._sleep_between_requests(start_time)
+        paper, start_article, end_article = await self._search_parallel(start_article, end_article, lambda article: self._probe_paper_date(base_url, article), compare, True, lambda start, end: self._get_search_paper(end_date + timedelta(days=1), start, end, True))
+        if paper is not None:
+            return paper
+        if start_article >= end_article - 1:
+            return start_article
+
+        return await self._get_end_paper(base_url, end_date, start_article, end_article, False)
+
+    async def _probe_paper_date(self, base_url: str, article: int) -> Optional[datetime]:
+        """Get the date of the article in a position, None if it can't be fetched"""
+        url = re.sub(r"\(\\size\+\)", str(1), base_url)  # set size
+        url = re.sub(r"\(\\from\+\)", str(article), url)  # set from
 
-        # close fetcher
-        await self.FETCHER.close()
+        data_json, status = await self.FETCHER.fetch_json(url=url)
+        if status is None or status == 404:
+            return None
+
+        article_list = self._get_nested_safe(data_json, self.ARTICLES_LIST_CONFIG.get("path"))
+        article_date = self._get_date(article_list[0]) if article_list is not None and len(article_list) > 0 else None
+        if article_date is None:
+            Logger.error("NETWORK", f"Don't found any articles for URL: {url}")
+            return None
+        self._paper_dates[article] = article_date
 
-        return all_articles
+        return article_date
 
-    async def _get_block_articles(self, urls: List[str]) -> List[Article]:
-        tasks = [self._get_articles(url) for url in urls]
-        block_articles = await asyncio.gather(*tasks, return_exceptions=False)
-        return [item for sublist in block_articles for item in sublist]
+    def _get_search_paper(self, target_date: datetime, start_article: int, end_article: int, interpolate: bool) -> int:
+        """Get the next paper to probe, estimated from the dates of the bounds already probed or the middle paper"""
+        mid_article = math.floor((start_article + end_article) / 2)
+        if not interpolate:
+            return mid_article
+
+        estimated_article = DateUtils.interpolate_position(target_date, start_article, end_article, self._paper_dates.get(start_article), self._paper_dates.get(end_article))
+        if estimated_article is None:
+            return mid_article
+
+        return estimated_article
+
+    # TODO: GET ARTICLES
+    async def get_articles(self, pages: List[str]) -> List[Article]:
+        """Get the list of articles from the url"""
+        return [article async for article in self.stream_articles(pages)]
+
+    async def stream_articles(self, pages: List[str]) -> AsyncIterator[Article]:
+        """Yield the articles from the url, the fetcher rate limit paces the requests"""
+        MAX_PENDING = self.FETCHER.MAX_CONCURRENT * 2
+
+        try:
+            async for articles in self._run_continuously(pages, self._get_articles, MAX_PENDING):
+                for article in articles:
+                    if self._keep_article(article):
+                        yield article.compact(self.article_mode)
+        finally:
+            # close fetcher
+            await self.FETCHER.close()
 
     async def _get_articles(self, url: str) -> List[Article]:
         data_json, status = await self.FETCHER.fetch_json(url)
@@ -1,10 +1,12 @@
-import re
+import asyncio
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from bs4 import BeautifulSoup
+from bs4.element import Tag
 
 from crawlers.generics.static_website import StaticWebsiteCrawler
+from utils.logger import Logger
 
 
 class TVNCrawler(StaticWebsiteCrawler):
@@ -20,15 +22,57 @@ class TVNCrawler(StaticWebsiteCrawler):
 
         pages = []
         for i in range(1, total_pages + 1):
-            page_url = re.sub(r"\(\\s\+\)", base_url, self.PAGES_CONFIG.get("url_pattern"))
-            page_url = re.sub(r"\(\\d\+\)", str(i), page_url)
-            pages.append(page_url)
+            pages.append(self._get_page_url(base_url, i))
 
         return pages[::-1]
 
+    # TODO: GET ARTICLES
+    async def _collect_article_urls(self, pages: List[str]) -> List[str]:
+        """Get the article urls, with early_stop walks the pages from the newest and stops at the first one already saved"""
+        if self.PAGES_CONFIG.get("early_stop") is not True or self.url_filter is None:
+            return await super()._collect_article_urls(pages)
+
+        # The listing pages done before a restart aren't fetched again
+        done_pages = self.CHECKPOINTS.set_pages(self.NAME.value, pages) if self.CHECKPOINTS is not None else {}
+
+        all_articles_urls = []
+        for base_url in self.BASE_URLS:
+            base_pages = [page for page in pages if page.startswith(base_url)]
+            all_articles_urls.extend(await self._collect_new_article_urls(base_pages[::-1], done_pages))
+
+        return all_articles_urls
+
+    async def _get_page_article_urls(self, page: str, done_pages: Dict[str, List[str]]) -> List[str]:
+        if page in done_pages:
+            return done_pages[page]
+
+        return await self._get_article_urls(page)
+
+    async def _collect_new_article_urls(self, newest_pages: List[str], done_pages: Dict[str, List[str]]) -> List[str]:
+        """Walk the pages from the newest, in blocks that grow up to the max concurrent requests"""
+        new_articles_urls = []
+
+        i = 0
+        block_size = 1
+        while i < len(newest_pages):
+            block_pages = newest_pages[i : i + block_size]
+            block_urls = await asyncio.gather(*[self._get_page_article_urls(page, done_pages) for page in block_pages], return_exceptions=False)
+
+            for page, page_urls in zip(block_pages, block_urls):
+                page_new_urls = await self.url_filter(page_urls)
+                new_articles_urls.extend(page_new_urls)
+
+                if len(page_urls) > 0 and len(page_new_urls) == 0:
+                    Logger.info(prefix="INFO", message=f"All articles already saved from page: {page}")
+                    return new_articles_urls
+
+            i += block_size
+            block_size = min(block_size * 2, self.FETCHER.MAX_CONCURRENT)
+
+        return new_articles_urls
+
     # TODO: ENCAPSULATION OF GET DATA FROM HTML
-    def _get_date(self, soup: BeautifulSoup) -> Optional[datetime]:
-        date_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("date").get("selectors"))
+    def _get_date(self, soup: BeautifulSoup, date_elem: Optional[Tag]) -> Optional[datetime]:
         if date_elem is not None:
             date_str = date_elem.get_text(strip=True)
             date_split = date_str.split(" ")
@@ -1,5 +1,3 @@
-import asyncio
-import time
 from datetime import datetime
 from typing import Any, List, Optional, Tuple
 
@@ -21,7 +19,7 @@ class ApiCrawler(BaseCrawler):
         # Config a fetcher manager
         delay = self.REQUESTS_CONFIG.get("retry_delay")
         concurrent = int(self.REQUESTS_CONFIG.get("requests_per_minute") / 60)
-        self.FETCHER = FetcherManager(retry_delay=delay, max_concurrent=concurrent)
+        self.FETCHER = FetcherManager(retry_delay=delay, max_concurrent=concurrent, requests_per_minute=self.REQUESTS_CONFIG.get("requests_per_minute"), cache=self._create_response_cache())
 
     # TODO: GENERATE PAGES
     async def generate_pages(self, base_url) -> List[str]:
@@ -130,7 +128,7 @@ class ApiCrawler(BaseCrawler):
 
         if self.ARTICLE_CONFIG.get("body").get("is_html") is True:
             body_html = body_elem
-            body = self.HTML_PARSER.handle(body_html).strip()
+            body = self.CONVERTER_POOL.handle(body_html).strip()
             return body, body_html
 
         return body_elem, None
@@ -160,13 +158,3 @@ class ApiCrawler(BaseCrawler):
                 return data
 
         return None
-
-    async def _sleep_between_requests(self, start_time: float) -> None:
-        """Sleep between requests"""
-        end_time = time.time()
-
-        # Calculate the time to sleep
-        time_to_sleep = 1 - (end_time - start_time)
-        if time_to_sleep > 0:
-            Logger.critical("TIMER", f"Sleeping for {time_to_sleep} seconds...")
-            await asyncio.sleep(time_to_sleep)
@@ -1,39 +1,253 @@
 import asyncio
+import dataclasses
 import math
+import os
 import re
-import time
-from datetime import datetime
-from typing import Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, ElementFilter
+from bs4.builder import builder_registry
 from bs4.element import Tag, ResultSet
 
-from core.models import Article, DateRange
+from core.models import Article, DateRange, PageProbe
 from crawlers._base import BaseCrawler
+from services.checkpoint_store import CheckpointStore
 from services.fetcher_manager import FetcherManager
+from services.page_index import PageIndex
+from services.parse_executor import ParseExecutor
+from services.response_cache import ResponseCache
 from utils.date_utils import DateUtils
+from utils.file_utils import FileUtils
 from utils.logger import Logger
 
 
+# Fields of the article config, in the order they are extracted
+ARTICLE_FIELDS = ["title", "author", "date", "tag", "drophead", "body"]
+
+
+@dataclass
+class ExtractionPlan:
+    """Article config compiled once by crawler"""
+
+    fields: Dict[str, List[soupsieve.SoupSieve]]  # compiled selectors by field, in priority order
+    any_field: soupsieve.SoupSieve | None  # union of all the selectors, to find the candidates in one pass
+    date_attribute: Optional[str]
+    date_format: Optional[str]
+    remove_elements: List[str]
+
+
+class ListingFilter(ElementFilter):
+    """Build only the subtrees of a listing page that the listing selectors can match.
+    Each selector is reduced to its first compound, the tags matching one of them are kept with all their descendants"""
+
+    # Supported first compounds: tag name, #id, .class and [attr] or [attr=value]
+    COMPOUND_PATTERN = re.compile(r"""(?P<name>[a-zA-Z][\w-]*)?(?P<parts>(?:[#.][\w-]+|\[[\w-]+(?:=(?:"[^"]*"|'[^']*'|[\w-]+))?\])*)""")
+    PART_PATTERN = re.compile(r"""([#.])([\w-]+)|\[([\w-]+)(?:=(?:"([^"]*)"|'([^']*)'|([\w-]+)))?\]""")
+
+    def __init__(self, roots: List[Tuple[Optional[str], Dict[str, Optional[str]], List[str]]]):
+        super().__init__()
+        self.ROOTS = roots  # name, attributes (None to only require the attribute) and classes of each first compound
+
+    @classmethod
+    def from_selectors(cls, selectors: List[str]) -> Optional["ListingFilter"]:
+        """Create the filter of the selectors, None if one of them needs the rest of the document"""
+        roots = []
+        for selector in selectors:
+            # Selector lists and sibling combinators reach outside the subtree of the first compound
+            if any(char in selector for char in ",+~"):
+                return None
+
+            compound = re.split(r"\s*>\s*|\s+", selector.strip(), maxsplit=1)[0]
+            match = cls.COMPOUND_PATTERN.fullmatch(compound)
+            if match is None or compound == "":
+                return None
+
+            attrs: Dict[str, Optional[str]] = {}
+            classes: List[str] = []
+            for part in cls.PART_PATTERN.finditer(match.group("parts")):
+                prefix, value, attr, double_quoted, single_quoted, unquoted = part.groups()
+                if prefix == ".":
+                    classes.append(value)
+                elif prefix == "#":
+                    attrs["id"] = value
+                elif "=" in part.group(0):
+                    attrs[attr] = double_quoted or single_quoted or unquoted or ""
+                else:
+                    attrs[attr] = None
+
+            name = match.group("name")
+            roots.append((name.lower() if name is not None else None, attrs, classes))
+
+        return cls(roots)
+
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[Dict[str, Any]]) -> bool:
+        attrs = attrs or {}
+        for root_name, root_attrs, root_classes in self.ROOTS:
+            if root_name is not None and root_name != name:
+                continue
+            if any(attr not in attrs or (value is not None and attrs[attr] != value) for attr, value in root_attrs.items()):
+                continue
+            if len(root_classes) > 0:
+                tag_classes = attrs.get("class") or ""
+                tag_classes = tag_classes.split() if isinstance(tag_classes, str) else tag_classes
+                if any(root_class not in tag_classes for root_class in root_classes):
+                    continue
+
+            return True
+
+        return False
+
+    def allow_string_creation(self, string: str) -> bool:
+        # Only the text inside the kept subtrees
+        return False
+
+
+# Crawlers created inside the parse workers, one per newspaper and process
+_WORKER_CRAWLERS: Dict[str, "StaticWebsiteCrawler"] = {}
+
+
+def _parse_article_fields(crawler_class: type, config: dict, date_range: DateRange, html: str, url: str) -> Dict[str, Any]:
+    """Parse the article inside a parse worker and return its plain fields"""
+    crawler = _WORKER_CRAWLERS.get(config.get("name"))
+    if crawler is None:
+        crawler = crawler_class(config, date_range)
+        _WORKER_CRAWLERS[config.get("name")] = crawler
+
+    article = crawler._parse_article(html, url)
+
+    fields = dataclasses.asdict(article)
+    fields.pop("newspaper")
+    fields.pop("url")
+    return fields
+
+
 class StaticWebsiteCrawler(BaseCrawler):
     """Crawler for static websites"""
 
     def __init__(self, config: dict, date_range: DateRange):
         super().__init__(config, date_range)
+        self.CONFIG = config
         self.PAGES_CONFIG = config.get("pages_config")
         self.ARTICLES_LIST_CONFIG = config.get("articles_list_config")
         self.ARTICLE_CONFIG = config.get("article_config")
+        self.EXTRACTION_PLAN = self._compile_extraction_plan()
 
         # Config a fetcher manager
         delay = self.REQUESTS_CONFIG.get("retry_delay")
         concurrent = int(self.REQUESTS_CONFIG.get("requests_per_minute") / 60)
-        self.FETCHER = FetcherManager(retry_delay=delay, max_concurrent=concurrent)
+        self.FETCHER = FetcherManager(retry_delay=delay, max_concurrent=concurrent, requests_per_minute=self.REQUESTS_CONFIG.get("requests_per_minute"), cache=self._create_response_cache())
+
+        # Config a parse executor, only when the crawler has parse workers
+        self.PARSER_CONFIG = config.get("parser_config") or {}
+        workers = self.PARSER_CONFIG.get("workers")
+        self.PARSE_EXECUTOR = ParseExecutor(max_workers=workers) if workers else None
+
+        # BeautifulSoup parsers of the article and listing pages, html.parser unless the config sets a faster one like lxml
+        self.ARTICLE_PARSER = self._get_parser_backend(self.PARSER_CONFIG.get("backend") or "html.parser")
+        self.LISTING_PARSER = self._get_parser_backend(self.PARSER_CONFIG.get("listing_backend") or self.ARTICLE_PARSER)
+        self.LISTING_FILTER = self._create_listing_filter()
+
+        # Listing pages already fetched during this crawl, by url
+        self._probes: Dict[str, asyncio.Future] = {}
+
+        # Last dates of the pages probed while searching the date range, by base url and page
+        self._page_dates: Dict[str, Dict[int, datetime]] = {}
+        self.PAGE_INDEX = self._create_page_index()
+
+        # Progress of the crawl, only when the crawler is resumable
+        self.CHECKPOINTS = self._create_checkpoint_store()
+
+    def _get_parser_backend(self, backend: str) -> str:
+        """Check the parser is installed, falling back to html.parser"""
+        if builder_registry.lookup(backend) is None:
+            Logger.info("INFO", f"Parser {backend} no disponible para {self.NAME.value}, se usa html.parser")
+            return "html.parser"
+
+        return backend
+
+    def _create_listing_filter(self) -> ListingFilter | None:
+        """Create the filter of the listing pages, only when the crawler has parser_config.partial_listing and its selectors allow it"""
+        if self.PARSER_CONFIG.get("partial_listing") is not True:
+            return None
+
+        selectors = list(self.ARTICLES_LIST_CONFIG.get("selectors"))
+        datetime_config = self.ARTICLES_LIST_CONFIG.get("datetime")
+        if datetime_config is not None:
+            selectors.append(datetime_config.get("selector"))
+
+        listing_filter = ListingFilter.from_selectors(selectors)
+        if listing_filter is None:
+            Logger.info("INFO", f"Los selectores de {self.NAME.value} necesitan la página completa, se parsea sin filtro")
+
+        return listing_filter
+
+    def _make_soup(self, html: Any, parser: str, parse_only: ElementFilter | None = None) -> BeautifulSoup:
+        """Format html with the parser of its kind of page"""
+        return BeautifulSoup(html, parser, parse_only=parse_only)
+
+    def _create_page_index(self) -> PageIndex | None:
+        """Create the page index of the newspaper, only when the crawler has pages_config.page_index"""
+        if self.PAGES_CONFIG.get("page_index") is not True:
+            return None
+
+        folder_path = FileUtils.create_folder("cache")
+        return PageIndex(file_path=os.path.join(folder_path, f"pages_{self.NAME.value}.json"))
+
+    def _create_checkpoint_store(self) -> CheckpointStore | None:
+        """Create the checkpoint store of the crawls, only when the crawler has resumable"""
+        if self.CONFIG.get("resumable") is not True:
+            return None
+
+        folder_path = FileUtils.create_folder("cache")
+        return CheckpointStore(db_path=os.path.join(folder_path, "checkpoints.sqlite"))
+
+    # TODO: CHECKPOINTS
+    def on_articles_saved(self, articles: List[Article]) -> None:
+        """Mark the saved articles as done"""
+        if self.CHECKPOINTS is not None:
+            self.CHECKPOINTS.mark_articles_done(self.NAME.value, [article.url for article in articles])
+
+    def on_crawl_saved(self) -> None:
+        """Remove the checkpoint of the finished crawl"""
+        if self.CHECKPOINTS is not None:
+            self.CHECKPOINTS.finish(self.NAME.value)
+            self.CHECKPOINTS.close()
+
+    def _resume_date_range(self) -> None:
+        """Extend the date range with the one of a stopped crawl, and save it for a later restart"""
+        saved_date_range = self.CHECKPOINTS.get_date_range(self.NAME.value)
+        if saved_date_range is not None:
+            start_date = min(saved_date_range[0], self.date_range.start_date)
+            end_date = max(saved_date_range[1], self.date_range.end_date)
+            Logger.info(prefix="INFO", message=f"Reanudando {self.NAME.value} entre {start_date.strftime('%d-%m-%Y')} y {end_date.strftime('%d-%m-%Y')}")
+            self.date_range = DateRange(start_date, end_date)
+
+        self.CHECKPOINTS.start(self.NAME.value, self.date_range.start_date, self.date_range.end_date)
 
     # TODO: GENERATE PAGES
+    async def _generate_all_pages(self) -> List[str]:
+        if self.CHECKPOINTS is not None:
+            self._resume_date_range()
+
+        return await super()._generate_all_pages()
+
     async def generate_pages(self, base_url: str) -> List[str]:
         """Generate the list of pages to crawl"""
         total_pages = await self._get_total_pages(base_url)
-        start_page, end_page = await self._get_range_pages(base_url, self.date_range.start_date, self.date_range.end_date, 1, total_pages)
+        if self.PAGE_INDEX is not None:
+            tasks = [self._get_indexed_start_page(base_url, self.date_range.start_date, total_pages), self._get_indexed_end_page(base_url, self.date_range.end_date, total_pages)]
+            start_page, end_page = await asyncio.gather(*tasks)
+
+            self.PAGE_INDEX.update(base_url, total_pages, self._page_dates.get(base_url, {}))
+            self.PAGE_INDEX.save()
+        elif self.PARALLEL_PROBES > 1:
+            tasks = [self._get_start_page_parallel(base_url, self.date_range.start_date, 1, total_pages), self._get_end_page_parallel(base_url, self.date_range.end_date, 1, total_pages)]
+            start_page, end_page = await asyncio.gather(*tasks)
+        else:
+            start_page, end_page = await self._get_range_pages(base_url, self.date_range.start_date, self.date_range.end_date, 1, total_pages)
         if end_page > start_page:
             start_page, end_page = end_page, start_page
 
@@ -41,25 +255,34 @@ class StaticWebsiteCrawler(BaseCrawler):
 
         pages = []
         for i in range(end_page, start_page + 1):
-            page_url = re.sub(r"\(\\s\+\)", base_url, self.PAGES_CONFIG.get("url_pattern"))
-            page_url = re.sub(r"\(\\d\+\)", str(i), page_url)
-            pages.append(page_url)
+            pages.append(self._get_page_url(base_url, i))
 
         return pages[::-1]
 
+    def _get_page_url(self, base_url: str, page: int) -> str:
+        """Get the url of the page number"""
+        page_url = re.sub(r"\(\\s\+\)", base_url, self.PAGES_CONFIG.get("url_pattern"))
+        page_url = re.sub(r"\(\\d\+\)", str(page), page_url)
+        return page_url
+
     async def _get_total_pages(self, base_url: str) -> int:
         """Get the total number of pages"""
-        url = re.sub(r"\(\\s\+\)", base_url, self.PAGES_CONFIG.get("url_pattern"))
-        url = re.sub(r"\(\\d\+\)", str(1), url)
+        url = self._get_page_url(base_url, 1)
 
         html, status = await self.FETCHER.fetch_html(url=url)
         if status is None or status == 404:
             return 0
 
         # Format html
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self._make_soup(html, self.LISTING_PARSER)
         pagination_config = self.PAGES_CONFIG.get("pagination")
 
+        # The first page is also a listing page, keep it for later
+        probe = self._build_probe(url, soup)
+        self._save_probe(probe)
+        if probe.last_date is not None:
+            self._page_dates.setdefault(base_url, {})[1] = probe.last_date
+
         # Get items from pagination
         page_items = soup.select(pagination_config.get("selector"))
         if len(page_items) == 0:
@@ -72,40 +295,23 @@ class StaticWebsiteCrawler(BaseCrawler):
 
         return int(last_item_url.split("/")[pagination_config.get("pos_href")])
 
-    async def _get_range_pages(self, base_url: str, start_date: datetime, end_date: datetime, start_page: int, end_page: int) -> Tuple[int, int]:
+    async def _get_range_pages(self, base_url: str, start_date: datetime, end_date: datetime, start_page: int, end_page: int, interpolate: bool = True) -> Tuple[int, int]:
         """Get the range of pages to crawl"""
         if start_page >= end_page - 1:
             return start_page, end_page
 
-        mid_page = math.floor((start_page + end_page) / 2)
+        mid_page = self._get_search_page(base_url, start_date + (end_date - start_date) / 2, start_page, end_page, interpolate)
 
-        url = re.sub(r"\(\\s\+\)", base_url, self.PAGES_CONFIG.get("url_pattern"))
-        url = re.sub(r"\(\\d\+\)", str(mid_page), url)
+        probe = await self._probe_search_page(base_url, mid_page)
+        if probe is None:
+            return await self._get_range_pages(base_url, start_date, end_date, start_page + 2, end_page, False)
 
-        html, status = await self.FETCHER.fetch_html(url=url)
-        if status is None or status == 404:
-            return await self._get_range_pages(base_url, start_date, end_date, start_page + 2, end_page)
-
-        # Format html
-        soup = BeautifulSoup(html, "html.parser")
-        datetime_config = self.ARTICLES_LIST_CONFIG.get("datetime")
-
-        # Get items
-        articles_date_items = soup.select(datetime_config.get("selector"))
-        
-        if len(articles_date_items) == 0:
-            Logger.error("NETWORK", f"Don't found any article dates for URL: {url}")
+        if probe.last_date is None:
+            Logger.error("NETWORK", f"Don't found any article dates for URL: {probe.url}")
             Logger.info(prefix="NETWORK", message=f"Retry in {self.FETCHER.RETRY_DELAY} seconds...")
             await asyncio.sleep(self.FETCHER.RETRY_DELAY)
-            return await self._get_range_pages(base_url, start_date, end_date, start_page + 2, end_page)
-        last_article_date_item = articles_date_items[-1]
-
-        if datetime_config.get("attribute") is not None:
-            last_article_date_str = last_article_date_item.get(datetime_config.get("attribute"))
-        else:
-            last_article_date_str = last_article_date_item.get_text(strip=True)
-
-        last_article_date = datetime.strptime(last_article_date_str, datetime_config.get("format"))
+            return await self._get_range_pages(base_url, start_date, end_date, start_page + 2, end_page, False)
+        last_article_date = probe.last_date
 
         # Binary search logic
         diff_start = DateUtils.diff_days(start_date, last_article_date)
@@ -114,158 +320,331 @@ class StaticWebsiteCrawler(BaseCrawler):
         if diff_start == 1 and diff_end == -1:
             return mid_page, mid_page
         elif diff_start == 1 and diff_end < -1:
-            return mid_page, await self._get_end_page(base_url, end_date, mid_page, end_page)
+            return mid_page, await self._get_end_page(base_url, end_date, mid_page, end_page, self._is_halved(start_page, end_page, mid_page, end_page))
         elif diff_start == 1 and diff_end > -1:
-            return mid_page, await self._get_end_page(base_url, end_date, start_page, mid_page)
+            return mid_page, await self._get_end_page(base_url, end_date, start_page, mid_page, self._is_halved(start_page, end_page, start_page, mid_page))
         elif diff_start < 1 and diff_end == -1:
-            return await self._get_start_page(base_url, start_date, mid_page, end_page), mid_page
+            return await self._get_start_page(base_url, start_date, mid_page, end_page, self._is_halved(start_page, end_page, mid_page, end_page)), mid_page
         elif diff_start > 1 and diff_end == -1:
-            return await self._get_start_page(base_url, start_date, start_page, mid_page), mid_page
+            return await self._get_start_page(base_url, start_date, start_page, mid_page, self._is_halved(start_page, end_page, start_page, mid_page)), mid_page
         elif diff_start < 1 and diff_end < -1:
-            return await self._get_range_pages(base_url, start_date, end_date, mid_page, end_page)
+            return await self._get_range_pages(base_url, start_date, end_date, mid_page, end_page, self._is_halved(start_page, end_page, mid_page, end_page))
         elif diff_start > 1 and diff_end > -1:
-            return await self._get_range_pages(base_url, start_date, end_date, start_page, mid_page)
+            return await self._get_range_pages(base_url, start_date, end_date, start_page, mid_page, self._is_halved(start_page, end_page, start_page, mid_page))
         elif diff_start < 1 and diff_end > -1:
-            tasks = [self._get_start_page(base_url, start_date, mid_page, end_page), self._get_end_page(base_url, end_date, start_page, mid_page)]
+            tasks = [self._get_start_page(base_url, start_date, mid_page, end_page, self._is_halved(start_page, end_page, mid_page, end_page)), self._get_end_page(base_url, end_date, start_page, mid_page, self._is_halved(start_page, end_page, start_page, mid_page))]
             results = await asyncio.gather(*tasks, return_exceptions=False)
             return results[0], results[1]
         elif diff_start > 1 and diff_end < -1:
-            tasks = [self._get_start_page(base_url, start_date, start_page, mid_page), self._get_end_page(base_url, end_date, mid_page, end_page)]
+            tasks = [self._get_start_page(base_url, start_date, start_page, mid_page, self._is_halved(start_page, end_page, start_page, mid_page)), self._get_end_page(base_url, end_date, mid_page, end_page, self._is_halved(start_page, end_page, mid_page, end_page))]
             results = await asyncio.gather(*tasks, return_exceptions=False)
             return results[0], results[1]
         else:
             return mid_page, mid_page
 
-    async def _get_start_page(self, base_url: str, start_date: datetime, start_page: int, end_page: int) -> int:
+    async def _get_start_page(self, base_url: str, start_date: datetime, start_page: int, end_page: int, interpolate: bool = True) -> int:
         """Get the start page to crawl"""
         if start_page >= end_page - 1:
             return end_page
 
-        mid_page = math.floor((start_page + end_page) / 2)
-
-        url = re.sub(r"\(\\s\+\)", base_url, self.PAGES_CONFIG.get("url_pattern"))
-        url = re.sub(r"\(\\d\+\)", str(mid_page), url)
-
-        html, status = await self.FETCHER.fetch_html(url=url)
-        if status is None or status == 404:
-            return await self._get_start_page(base_url, start_date, start_page + 2, end_page)
+        mid_page = self._get_search_page(base_url, start_date - timedelta(days=1), start_page, end_page, interpolate)
 
-        # Format html
-        soup = BeautifulSoup(html, "html.parser")
-        datetime_config = self.ARTICLES_LIST_CONFIG.get("datetime")
+        probe = await self._probe_search_page(base_url, mid_page)
+        if probe is None:
+            return await self._get_start_page(base_url, start_date, start_page + 2, end_page, False)
 
-        # Get items
-        articles_date_items = soup.select(datetime_config.get("selector"))
-        if len(articles_date_items) == 0:
-            Logger.error("NETWORK", f"Don't found any article dates for URL: {url}")
+        if probe.last_date is None:
+            Logger.error("NETWORK", f"Don't found any article dates for URL: {probe.url}")
             Logger.info(prefix="NETWORK", message=f"Retry in {self.FETCHER.RETRY_DELAY} seconds...")
             await asyncio.sleep(self.FETCHER.RETRY_DELAY)
-            return await self._get_start_page(base_url, start_date, start_page + 2, end_page)
-        last_article_date_item = articles_date_items[-1]
-
-        if datetime_config.get("attribute") is not None:
-            last_article_date_str = last_article_date_item.get(datetime_config.get("attribute"))
-        else:
-            last_article_date_str = last_article_date_item.get_text(strip=True)
-
-        last_article_date = datetime.strptime(last_article_date_str, datetime_config.get("format"))
+            return await self._get_start_page(base_url, start_date, start_page + 2, end_page, False)
+        last_article_date = probe.last_date
 
         # Binary search logic
         diff = DateUtils.diff_days(start_date, last_article_date)
         if diff == 1:
             return mid_page
         elif diff > 1:
-            return await self._get_start_page(base_url, start_date, start_page, mid_page)
+            return await self._get_start_page(base_url, start_date, start_page, mid_page, self._is_halved(start_page, end_page, start_page, mid_page))
         else:
-            return await self._get_start_page(base_url, start_date, mid_page, end_page)
+            return await self._get_start_page(base_url, start_date, mid_page, end_page, self._is_halved(start_page, end_page, mid_page, end_page))
 
-    async def _get_end_page(self, base_url: str, end_date: datetime, start_page: int, end_page: int) -> int:
+    async def _get_end_page(self, base_url: str, end_date: datetime, start_page: int, end_page: int, interpolate: bool = True) -> int:
         """Get the end page to crawl"""
         if start_page >= end_page - 1:
             return start_page
 
+        mid_page = self._get_search_page(base_url, end_date + timedelta(days=1), start_page, end_page, interpolate)
+
+        probe = await self._probe_search_page(base_url, mid_page)
+        if probe is None:
+            return await self._get_end_page(base_url, end_date, start_page, end_page - 1, False)
+
+        if probe.last_date is None:
+            Logger.error("NETWORK", f"Don't found any article dates for URL: {probe.url}")
+            Logger.info(prefix="NETWORK", message=f"Retry in {self.FETCHER.RETRY_DELAY} seconds...")
+            await asyncio.sleep(self.FETCHER.RETRY_DELAY)
+            return await self._get_end_page(base_url, end_date, start_page, end_page - 1, False)
+        last_article_date = probe.last_date
+
+        # Binary search logic
+        diff = DateUtils.diff_days(end_date, last_article_date)
+        if diff == -1:
+            return mid_page
+        elif diff < -1:
+            return await self._get_end_page(base_url, end_date, mid_page, end_page, self._is_halved(start_page, end_page, mid_page, end_page))
+        else:
+            return await self._get_end_page(base_url, end_date, start_page, mid_page, self._is_halved(start_page, end_page, start_page, mid_page))
+
+    async def _get_start_page_parallel(self, base_url: str, start_date: datetime, start_page: int, end_page: int) -> int:
+        """Get the start page to crawl probing several pages at once"""
+        page, start_page, end_page = await self._search_parallel(start_page, end_page, lambda page: self._probe_page_date(base_url, page), lambda date: self._compare_start_date(start_date, date), False, lambda start, end: self._get_search_page(base_url, start_date - timedelta(days=1), start, end, True))
+        if page is not None:
+            return page
+        if start_page >= end_page - 1:
+            return end_page
+
+        return await self._get_start_page(base_url, start_date, start_page, end_page, False)
+
+    async def _get_end_page_parallel(self, base_url: str, end_date: datetime, start_page: int, end_page: int) -> int:
+        """Get the end page to crawl probing several pages at once"""
+        page, start_page, end_page = await self._search_parallel(start_page, end_page, lambda page: self._probe_page_date(base_url, page), lambda date: self._compare_end_date(end_date, date), True, lambda start, end: self._get_search_page(base_url, end_date + timedelta(days=1), start, end, True))
+        if page is not None:
+            return page
+        if start_page >= end_page - 1:
+            return start_page
+
+        return await self._get_end_page(base_url, end_date, start_page, end_page, False)
+
+    async def _get_indexed_start_page(self, base_url: str, start_date: datetime, total_pages: int) -> int:
+        """Get the start page to crawl searching between the pages predicted by the page index, or all of them"""
+        bounds = await self._get_indexed_bounds(base_url, start_date - timedelta(days=1), total_pages, lambda date: self._compare_start_date(start_date, date))
+        if bounds is not None:
+            return await self._get_start_page(base_url, start_date, bounds[0], bounds[1])
+
+        if self.PARALLEL_PROBES > 1:
+            return await self._get_start_page_parallel(base_url, start_date, 1, total_pages)
+        return await self._get_start_page(base_url, start_date, 1, total_pages)
+
+    async def _get_indexed_end_page(self, base_url: str, end_date: datetime, total_pages: int) -> int:
+        """Get the end page to crawl searching between the pages predicted by the page index, or all of them"""
+        bounds = await self._get_indexed_bounds(base_url, end_date + timedelta(days=1), total_pages, lambda date: self._compare_end_date(end_date, date))
+        if bounds is not None:
+            return await self._get_end_page(base_url, end_date, bounds[0], bounds[1])
+
+        if self.PARALLEL_PROBES > 1:
+            return await self._get_end_page_parallel(base_url, end_date, 1, total_pages)
+        return await self._get_end_page(base_url, end_date, 1, total_pages)
+
+    async def _get_indexed_bounds(self, base_url: str, target_date: datetime, total_pages: int, compare: Callable[[datetime], int]) -> Optional[Tuple[int, int]]:
+        """Get the bounds of the search around the page predicted by the page index, None if it can't be verified"""
+        page = self.PAGE_INDEX.predict(base_url, target_date, total_pages)
+        if page is None:
+            return None
+        page = min(max(page, 1), total_pages)
+
+        last_article_date = await self._probe_page_date(base_url, page)
+        if last_article_date is None:
+            return None
+
+        order = compare(last_article_date)
+        if order == 0:
+            return page, page
+
+        # Gallop to the side of the target until a page is past it, the archive ends are always valid bounds
+        step = self.PAGE_INDEX.MARGIN
+        while True:
+            other_page = min(max(page + order * step, 1), total_pages)
+            if other_page == 1 or other_page == total_pages:
+                break
+
+            other_page_date = await self._probe_page_date(base_url, other_page)
+            if other_page_date is None:
+                return None
+            if compare(other_page_date) * order <= 0:
+                break
+
+            page, step = other_page, step * 2
+
+        return min(page, other_page), max(page, other_page)
+
+    def _compare_start_date(self, start_date: datetime, last_article_date: datetime) -> int:
+        """Compare the last date of a page with the start page, 0 if it is the start page, < 0 if it is after and > 0 if it is before"""
+        diff = DateUtils.diff_days(start_date, last_article_date)
+        return 0 if diff == 1 else -1 if diff > 1 else 1
+
+    def _compare_end_date(self, end_date: datetime, last_article_date: datetime) -> int:
+        """Compare the last date of a page with the end page, 0 if it is the end page, < 0 if it is after and > 0 if it is before"""
+        diff = DateUtils.diff_days(end_date, last_article_date)
+        return 0 if diff == -1 else 1 if diff < -1 else -1
+
+    def _get_search_page(self, base_url: str, target_date: datetime, start_page: int, end_page: int, interpolate: bool) -> int:
+        """Get the next page to probe, estimated from the dates of the bounds already probed or the middle page"""
         mid_page = math.floor((start_page + end_page) / 2)
+        if not interpolate:
+            return mid_page
 
-        url = re.sub(r"\(\\s\+\)", base_url, self.PAGES_CONFIG.get("url_pattern"))
-        url = re.sub(r"\(\\d\+\)", str(mid_page), url)
+        start_page_date = self._get_probed_date(self._get_page_url(base_url, start_page))
+        end_page_date = self._get_probed_date(self._get_page_url(base_url, end_page))
 
-        html, status = await self.FETCHER.fetch_html(url=url)
+        estimated_page = DateUtils.interpolate_position(target_date, start_page, end_page, start_page_date, end_page_date)
+        if estimated_page is None:
+            return mid_page
+
+        return estimated_page
+
+    # TODO: PAGE PROBES
+    async def _probe_page(self, url: str) -> Optional[PageProbe]:
+        """Get the dates and article urls of a listing page, fetching it only once per crawl"""
+        probe_task = self._probes.get(url)
+        if probe_task is None:
+            probe_task = asyncio.ensure_future(self._fetch_probe(url))
+            self._probes[url] = probe_task
+
+        probe = await probe_task
+        if probe is None:
+            # Don't keep the failed fetches, a later call can retry them
+            self._probes.pop(url, None)
+
+        return probe
+
+    async def _fetch_probe(self, url: str) -> Optional[PageProbe]:
+        html, status = await self.FETCHER.fetch_html(url)
         if status is None or status == 404:
-            return await self._get_end_page(base_url, end_date, start_page, end_page - 1)
+            return None
+
+        # Format html, the pagination isn't needed after the first page
+        soup = self._make_soup(html, self.LISTING_PARSER, self.LISTING_FILTER)
+        return self._build_probe(url, soup)
+
+    async def _probe_search_page(self, base_url: str, page: int) -> Optional[PageProbe]:
+        """Probe a listing page while searching the date range, keeping its last date for the page index"""
+        probe = await self._probe_page(self._get_page_url(base_url, page))
+        if probe is not None and probe.last_date is not None:
+            self._page_dates.setdefault(base_url, {})[page] = probe.last_date
+
+        return probe
+
+    async def _probe_page_date(self, base_url: str, page: int) -> Optional[datetime]:
+        """Get the last date of a listing page, None if the page can't be fetched or has no dates"""
+        probe = await self._probe_search_page(base_url, page)
+        if probe is None:
+            return None
+
+        if probe.last_date is None:
+            Logger.error("NETWORK", f"Don't found any article dates for URL: {probe.url}")
+            return None
+
+        return probe.last_date
+
+    def _get_probed_date(self, url: str) -> Optional[datetime]:
+        """Get the last date of a listing page already probed, without fetching it"""
+        probe_task = self._probes.get(url)
+        if probe_task is None or not probe_task.done() or probe_task.cancelled() or probe_task.exception() is not None:
+            return None
+
+        probe = probe_task.result()
+        return probe.last_date if probe is not None else None
+
+    def _save_probe(self, probe: PageProbe) -> None:
+        """Keep a probe built from a page fetched elsewhere"""
+        probe_future = asyncio.get_running_loop().create_future()
+        probe_future.set_result(probe)
+        self._probes[probe.url] = probe_future
+
+    def _build_probe(self, url: str, soup: BeautifulSoup) -> PageProbe:
+        probe = PageProbe(url, article_urls=self._get_article_urls_from_soup(soup))
 
-        # Format html
-        soup = BeautifulSoup(html, "html.parser")
         datetime_config = self.ARTICLES_LIST_CONFIG.get("datetime")
+        if datetime_config is None:
+            return probe
 
         # Get items
         articles_date_items = soup.select(datetime_config.get("selector"))
         if len(articles_date_items) == 0:
-            Logger.error("NETWORK", f"Don't found any article dates for URL: {url}")
-            Logger.info(prefix="NETWORK", message=f"Retry in {self.FETCHER.RETRY_DELAY} seconds...")
-            await asyncio.sleep(self.FETCHER.RETRY_DELAY)
-            return await self._get_end_page(base_url, end_date, start_page, end_page - 1)
-        last_article_date_item = articles_date_items[-1]
+            return probe
 
+        probe.first_date = self._get_list_item_date(articles_date_items[0], datetime_config)
+        probe.last_date = self._get_list_item_date(articles_date_items[-1], datetime_config)
+        return probe
+
+    def _get_list_item_date(self, date_item: Tag, datetime_config: dict) -> Optional[datetime]:
         if datetime_config.get("attribute") is not None:
-            last_article_date_str = last_article_date_item.get(datetime_config.get("attribute"))
+            date_str = date_item.get(datetime_config.get("attribute"))
         else:
-            last_article_date_str = last_article_date_item.get_text(strip=True)
-
-        last_article_date = datetime.strptime(last_article_date_str, datetime_config.get("format"))
+            date_str = date_item.get_text(strip=True)
 
-        # Binary search logic
-        diff = DateUtils.diff_days(end_date, last_article_date)
-        if diff == -1:
-            return mid_page
-        elif diff < -1:
-            return await self._get_end_page(base_url, end_date, mid_page, end_page)
-        else:
-            return await self._get_end_page(base_url, end_date, start_page, mid_page)
+        try:
+            return datetime.strptime(date_str, datetime_config.get("format"))
+        except (TypeError, ValueError):
+            return None
 
     # TODO: GET ARTICLES
     async def get_articles(self, pages: List[str]) -> List[Article]:
         """Get articles from the pages"""
-        BLOCK_SIZE = int(self.REQUESTS_CONFIG.get("requests_per_minute") / 60)
+        return [article async for article in self.stream_articles(pages)]
 
-        # Get all article urls
-        all_articles_urls = []
-        for i in range(0, len(pages), BLOCK_SIZE):
-            start_time = time.time()
-            article_urls = await self._get_articles_urls(pages[i : i + BLOCK_SIZE])
-            all_articles_urls.extend(article_urls)
-            await self._sleep_between_requests(start_time)
+    async def stream_articles(self, pages: List[str]) -> AsyncIterator[Article]:
+        """Yield the articles from the pages, the fetcher rate limit paces the requests"""
+        MAX_PENDING = self.FETCHER.MAX_CONCURRENT * 2
 
-        Logger.info(prefix="SPIDER", message=f"Obteniendo {len(all_articles_urls)} artículos")
+        try:
+            # Get all article urls
+            all_articles_urls = await self._collect_article_urls(pages)
+
+            # The listing pages aren't needed anymore
+            self._probes.clear()
+
+            # Skip the articles saved before a restart
+            if self.CHECKPOINTS is not None:
+                done_urls = self.CHECKPOINTS.get_done_articles(self.NAME.value)
+                all_articles_urls = [url for url in all_articles_urls if url not in done_urls]
+
+            Logger.info(prefix="SPIDER", message=f"Obteniendo {len(all_articles_urls)} artículos")
+
+            # Get all articles from the urls
+            async for url, article in self._run_continuously(all_articles_urls, self._get_article_by_url, MAX_PENDING):
+                if self._keep_article(article):
+                    yield article.compact(self.article_mode)
+                elif article is not None and self.CHECKPOINTS is not None:
+                    # Outside the date range, nothing to save but done. The failed ones stay pending to be retried
+                    self.CHECKPOINTS.mark_articles_done(self.NAME.value, [url])
+        finally:
+            # Close fetcher and parse workers
+            await self.FETCHER.close()
+            if self.PARSE_EXECUTOR is not None:
+                await self.PARSE_EXECUTOR.close()
+
+    async def _collect_article_urls(self, pages: List[str]) -> List[str]:
+        """Get the article urls from all the pages, without the ones removed by the url filter"""
+        MAX_PENDING = self.FETCHER.MAX_CONCURRENT * 2
+
+        # The listing pages done before a restart aren't fetched again
+        done_pages = self.CHECKPOINTS.set_pages(self.NAME.value, pages) if self.CHECKPOINTS is not None else {}
 
-        # Get all articles from the urls
-        all_articles = []
-        for i in range(0, len(all_articles_urls), BLOCK_SIZE):
-            start_time = time.time()
-            articles = await self._get_articles(all_articles_urls[i : i + BLOCK_SIZE])
-            if self.REQUESTS_CONFIG.get("filter_inside_date_range") is not None and self.REQUESTS_CONFIG.get("filter_inside_date_range") is False:
-                all_articles.extend(filter(lambda a: (a is not None), articles))
-            else:
-                all_articles.extend(filter(lambda a: (a is not None) and (a.date >= self.date_range.start_date and a.date <= self.date_range.end_date), articles))
-            
-            await self._sleep_between_requests(start_time)
+        all_articles_urls = []
+        for article_urls in done_pages.values():
+            all_articles_urls.extend(article_urls)
 
-        # Close fetcher
-        await self.FETCHER.close()
+        async for article_urls in self._run_continuously([page for page in pages if page not in done_pages], self._get_article_urls, MAX_PENDING):
+            all_articles_urls.extend(article_urls)
 
-        return all_articles
+        if self.url_filter is not None:
+            all_articles_urls = await self.url_filter(all_articles_urls)
 
-    async def _get_articles_urls(self, pages: List[str]) -> List[str]:
-        tasks = [self._get_article_urls(page) for page in pages]
-        block_urls = await asyncio.gather(*tasks, return_exceptions=False)
-        return [item for sublist in block_urls for item in sublist]
+        return all_articles_urls
 
     async def _get_article_urls(self, page: str) -> List[str]:
-        html, status = await self.FETCHER.fetch_html(page)
-        if status is None or status == 404:
+        probe = await self._probe_page(page)
+        if probe is None:
             return []
 
-        # Format html
-        soup = BeautifulSoup(html, "html.parser")
+        if self.CHECKPOINTS is not None:
+            self.CHECKPOINTS.mark_page_done(self.NAME.value, page, probe.article_urls)
+
+        return probe.article_urls
+
+    def _get_article_urls_from_soup(self, soup: BeautifulSoup) -> List[str]:
         selectors = []
         for selector in self.ARTICLES_LIST_CONFIG.get("selectors"):
             selectors.append(f"{selector} {self.ARTICLES_LIST_CONFIG.get('url').get('selector')}")
@@ -286,17 +665,16 @@ class StaticWebsiteCrawler(BaseCrawler):
 
         return list(article_urls)
 
-    async def _get_articles(self, urls: List[str]) -> List[Article]:
-        tasks = [self._get_article(url) for url in urls]
-        return await asyncio.gather(*tasks, return_exceptions=False)
+    async def _get_article_by_url(self, url: str) -> Tuple[str, Article | None]:
+        return url, await self._get_article(url)
 
     async def _get_article(self, url: str) -> Article | None:
-        html, status = await self.FETCHER.fetch_html(url)
+        html, status = await self.FETCHER.fetch_html(url, url_class=ResponseCache.ARTICLE)
         if status is None or status == 404:
             return None
 
         try:
-            article = self._parse_article(html, url)
+            article = await self._parse_html(html, url)
             if article.date is None:
                 Logger.error("DB", f"No se ha podido obtener los datos de la noticia: {url}")
                 print(article)
@@ -308,110 +686,150 @@ class StaticWebsiteCrawler(BaseCrawler):
             return None
 
     # TODO: PARSE ARTICLE
+    async def _parse_html(self, html: str, url: str) -> Article:
+        """Parse the article in the parse workers when configured, otherwise in the event loop"""
+        if self.PARSE_EXECUTOR is None:
+            return self._parse_article(html, url)
+
+        fields = await self.PARSE_EXECUTOR.run(_parse_article_fields, type(self), self.CONFIG, self.date_range, html, url)
+        return Article(self.NAME, url, **fields)
+
     def _parse_article(self, html: Any, url: str) -> Article:
         # Change html to BeautifulSoup
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self._make_soup(html, self.ARTICLE_PARSER)
+
+        # Find the elements of all the fields at once
+        elems = self._match_extraction_plan(soup)
 
         # Create article
         article = Article(self.NAME, url)
 
         # TITLE
-        title = self._get_title(soup)
+        title = self._get_title(soup, elems.get("title"))
         if title is not None:
             article.title = title
 
         # AUTHOR
-        author = self._get_author(soup)
+        author = self._get_author(soup, elems.get("author"))
         if author is not None:
             article.author = author
 
         # DATE
-        date = self._get_date(soup)
+        date = self._get_date(soup, elems.get("date"))
         if date is not None:
             article.date = date
 
         # TAG
-        tag = self._get_tag(soup)
+        tag = self._get_tag(soup, elems.get("tag"))
         if tag is not None:
             article.tag = tag
 
         # DROPHEAD
-        drophead = self._get_drophead(soup)
+        drophead = self._get_drophead(soup, elems.get("drophead"))
         if drophead is not None:
             article.drophead = drophead
 
         # BODY
-        body, body_html = self._get_body(soup)
+        body, body_html = self._get_body(soup, elems.get("body"))
         if body is not None:
             article.body = body
             article.body_html = body_html
 
         return article
 
+    def _compile_extraction_plan(self) -> ExtractionPlan:
+        """Compile the article config once: the selectors of every field, the date attribute and format and the elements removed from the body"""
+        fields = {}
+        for field in ARTICLE_FIELDS:
+            field_config = self.ARTICLE_CONFIG.get(field) or {}
+            fields[field] = [soupsieve.compile(selector) for selector in field_config.get("selectors") or []]
+
+        all_selectors = [selector.pattern for selectors in fields.values() for selector in selectors]
+
+        date_config = self.ARTICLE_CONFIG.get("date") or {}
+        body_config = self.ARTICLE_CONFIG.get("body") or {}
+        return ExtractionPlan(
+            fields=fields,
+            any_field=soupsieve.compile(", ".join(all_selectors)) if len(all_selectors) > 0 else None,
+            date_attribute=date_config.get("attribute"),
+            date_format=date_config.get("format"),
+            remove_elements=body_config.get("remove_elements") or [],
+        )
+
+    def _match_extraction_plan(self, soup: BeautifulSoup) -> Dict[str, Tag]:
+        """Find the element of every field in a single pass over the document, like select_one the first selector of a field with a match wins"""
+        plan = self.EXTRACTION_PLAN
+        matches: Dict[str, Tuple[int, Tag]] = {}
+        if plan.any_field is None:
+            return {}
+
+        # Only the elements that match some selector are checked against the selectors of each field
+        for elem in plan.any_field.iselect(soup):
+            for field, selectors in plan.fields.items():
+                match = matches.get(field)
+                for i in range(match[0] if match is not None else len(selectors)):
+                    if selectors[i].match(elem):
+                        matches[field] = (i, elem)
+                        break
+
+            # Every field already has the element of its first selector
+            if len(matches) == len(plan.fields) and all(i == 0 for i, _ in matches.values()):
+                break
+
+        return {field: elem for field, (_, elem) in matches.items()}
+
     # TODO: ENCAPSULATION OF GET DATA FROM HTML
-    def _get_title(self, soup: BeautifulSoup) -> Optional[str]:
-        title_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("title").get("selectors"))
+    def _get_title(self, soup: BeautifulSoup, title_elem: Optional[Tag]) -> Optional[str]:
         if title_elem is not None:
             return title_elem.get_text(strip=True)
 
         return None
     
-    def _get_author(self, soup: BeautifulSoup) -> Optional[str]:
-        author_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("author").get("selectors"))
+    def _get_author(self, soup: BeautifulSoup, author_elem: Optional[Tag]) -> Optional[str]:
         if author_elem is not None:
             return author_elem.get_text(strip=True)
 
         return None
 
-    def _get_date(self, soup: BeautifulSoup) -> Optional[datetime]:
-        date_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("date").get("selectors"))
+    def _get_date(self, soup: BeautifulSoup, date_elem: Optional[Tag]) -> Optional[datetime]:
         if date_elem is not None:
-            if self.ARTICLE_CONFIG.get("date").get("attribute") is not None:
-                datetime_str = date_elem.get(self.ARTICLE_CONFIG.get("date").get("attribute"))
+            if self.EXTRACTION_PLAN.date_attribute is not None:
+                datetime_str = date_elem.get(self.EXTRACTION_PLAN.date_attribute)
             else:
                 datetime_str = date_elem.get_text(strip=True)
 
-            return datetime.strptime(datetime_str, self.ARTICLE_CONFIG.get("date").get("format"))
+            return datetime.strptime(datetime_str, self.EXTRACTION_PLAN.date_format)
         
         return None
     
-    def _get_tag(self, soup: BeautifulSoup) -> Optional[str]:
-        tag_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("tag").get("selectors"))
+    def _get_tag(self, soup: BeautifulSoup, tag_elem: Optional[Tag]) -> Optional[str]:
         if tag_elem is not None:
             return tag_elem.get_text(strip=True)
 
         return None
     
-    def _get_drophead(self, soup: BeautifulSoup) -> Optional[str]:
-        drophead_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("drophead").get("selectors"))
+    def _get_drophead(self, soup: BeautifulSoup, drophead_elem: Optional[Tag]) -> Optional[str]:
         if drophead_elem is not None:
             return drophead_elem.get_text(strip=True)
 
         return None
     
-    def _get_body(self, soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
-        body_elem = self._get_html_elem(soup, self.ARTICLE_CONFIG.get("body").get("selectors"))
+    def _get_body(self, soup: BeautifulSoup, body_elem: Optional[Tag]) -> Tuple[Optional[str], Optional[str]]:
         if body_elem is not None:
-            for remove_elem in self.ARTICLE_CONFIG.get("body").get("remove_elements"):
+            # Removed by tag name
+            for remove_elem in self.EXTRACTION_PLAN.remove_elements:
                 for elem in body_elem.find_all(remove_elem):
                     elem.decompose()
 
-            body_html = body_elem.decode_contents(formatter="html")
-            body = self.HTML_PARSER.handle(body_html).strip()
+            # Text and html in a single walk of the body
+            body, body_html = self.CONVERTER_POOL.convert(body_elem)
+            body = body.strip()
             
             return body, body_html
         
         return None, None
 
     # TODO: UTILS
-    def _get_html_elem(self, soup: BeautifulSoup, selectors: List[str]) -> Optional[Tag]:
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem is not None:
-                return elem
-
-        return None
-
     def _get_html_elements(self, soup: BeautifulSoup, selectors: List[str]) -> Optional[ResultSet[Tag]]:
         for selector in selectors:
             elems = soup.select(selector)
@@ -419,13 +837,3 @@ class StaticWebsiteCrawler(BaseCrawler):
                 return elems
 
         return None
-
-    async def _sleep_between_requests(self, start_time: float) -> None:
-        """Sleep between requests"""
-        end_time = time.time()
-
-        # Calculate the time to sleep
-        time_to_sleep = 1 - (end_time - start_time)
-        if time_to_sleep > 0:
-            Logger.critical("TIMER", f"Sleeping for {time_to_sleep} seconds...")
-            await asyncio.sleep(time_to_sleep)
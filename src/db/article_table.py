@@ -1,5 +1,6 @@
+import hashlib
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Set, Tuple
 
 import pymongo
 
@@ -9,67 +10,162 @@ from utils.logger import Logger
 
 
 class ArticleTable:
-    def __init__(self, mongodb_connection: MongoConnection):
+    def __init__(self, mongodb_connection: MongoConnection, batch_size: int = 500):
         self.collection_name = "articles"
 
-        collection_list = mongodb_connection.db.list_collection_names()
-        if self.collection_name not in collection_list:
-            mongodb_connection.db.create_collection(self.collection_name)
-            mongodb_connection.db[self.collection_name].create_index([("url", 1)], unique=True)
-            mongodb_connection.db[self.collection_name].create_index([("newspaper", 1), ("date", -1)])
+        # Max number of upserts by bulk write
+        self.batch_size = batch_size
+
+        # Create the collection and its indexes only once by connection
+        if self.collection_name not in mongodb_connection.ready_collections:
+            collection_list = mongodb_connection.db.list_collection_names()
+            if self.collection_name not in collection_list:
+                mongodb_connection.db.create_collection(self.collection_name)
+                mongodb_connection.db[self.collection_name].create_index([("url", 1)], unique=True)
+                mongodb_connection.db[self.collection_name].create_index([("newspaper", 1), ("date", -1)])
+            mongodb_connection.ready_collections.add(self.collection_name)
 
         self.collection = mongodb_connection.db[self.collection_name]
 
-    def save_articles(self, articles: List[Article]) -> None:
-        try:
-            BATCH_SIZE = 500
-            operations = []
+        # Last date saved by newspaper, None when it has no articles, kept up to date by save_articles
+        self._last_dates: Dict[str, datetime | None] = {}
 
+    def save_articles(self, articles: List[Article]) -> bool:
+        try:
             articles_sorted = sorted(articles, key=lambda p: p.date or datetime.min)
-            for article in articles_sorted:
-                try:
-                    document = {
-                        "url": article.url,
-                        "newspaper": article.newspaper.value,
-                        "title": article.title,
-                        "author": article.author,
-                        "date": article.date,
-                        "tag": article.tag,
-                        "drophead": article.drophead,
-                        "body": article.body,
-                        "body_html": article.body_html,
-                    }
-
-                    operations.append(
-                        pymongo.UpdateOne(
-                            filter={"url": article.url},
-                            update={"$set": document},
-                            upsert=True,
-                        )
-                    )
-                except Exception as e:
-                    Logger.error("DB", f"Error al guardar el artículo: {article.url} [Error: {e}]")
-                    continue
+            total_skipped = 0
+
+            for i in range(0, len(articles_sorted), self.batch_size):
+                operations, skipped = self._get_upserts(articles_sorted[i : i + self.batch_size])
+                total_skipped += skipped
 
-                if len(operations) == BATCH_SIZE:
+                if len(operations) > 0:
                     self.collection.bulk_write(operations, ordered=False)
-                    operations.clear()
 
-            if len(operations) > 0:
-                self.collection.bulk_write(operations, ordered=False)
+            self._update_last_dates(articles_sorted)
 
+            if total_skipped > 0:
+                Logger.info("DB", f"{total_skipped} artículos sin cambios")
             Logger.info("FILE", "Articles saved successfully to MongoDB")
+            return True
         except Exception as e:
             Logger.error("DB", f"Error al guardar los artículos: {e}")
+            return False
+
+    def _get_upserts(self, articles: List[Article]) -> Tuple[List[pymongo.UpdateOne], int]:
+        """Get the writes of the articles that are new or changed, and the number of unchanged ones"""
+        saved_hashes = self._get_saved_hashes([article.url for article in articles])
+        operations = []
+        skipped = 0
+
+        for article in articles:
+            try:
+                document = {
+                    "url": article.url,
+                    "newspaper": article.newspaper.value,
+                    "title": article.title,
+                    "author": article.author,
+                    "date": article.date,
+                    "tag": article.tag,
+                    "drophead": article.drophead,
+                    "body": article.body,
+                }
+                # Without the html kept in memory (NO_HTML) the saved body_html is left as it is
+                if not article.html_dropped:
+                    document["body_html"] = article.body_html
+                document["content_hash"] = self._get_content_hash(document)
+
+                if article.url not in saved_hashes:
+                    # Only written if it is still missing, a concurrent insert isn't overwritten
+                    update = {"$setOnInsert": {"body_html": None, **document}}
+                elif saved_hashes[article.url] != document["content_hash"]:
+                    update = {"$set": document}
+                else:
+                    skipped += 1
+                    continue
+
+                operations.append(
+                    pymongo.UpdateOne(
+                        filter={"url": article.url},
+                        update=update,
+                        upsert=True,
+                    )
+                )
+            except Exception as e:
+                Logger.error("DB", f"Error al guardar el artículo: {article.url} [Error: {e}]")
+                continue
+
+        return operations, skipped
+
+    def _get_saved_hashes(self, urls: List[str]) -> Dict[str, str | None]:
+        """Get the content hash of the urls already saved, None for the documents saved without it"""
+        cursor = self.collection.find({"url": {"$in": urls}}, projection={"url": 1, "content_hash": 1, "_id": 0})
+        return {document["url"]: document.get("content_hash") for document in cursor}
+
+    @staticmethod
+    def _get_content_hash(document: Dict[str, Any]) -> str:
+        """Hash of the fields of the article, to know if a saved document changed. A missing body_html isn't hashed"""
+        content = [document.get(key) for key in ["newspaper", "title", "author", "date", "tag", "drophead", "body", "body_html"] if key in document]
+        return hashlib.sha1(repr(content).encode("utf-8")).hexdigest()
+
+    def get_saved_urls(self, urls: List[str]) -> Set[str]:
+        """Get which of the urls are already saved, querying them in batches"""
+        BATCH_SIZE = 1000
+        saved_urls = set()
+
+        try:
+            for i in range(0, len(urls), BATCH_SIZE):
+                cursor = self.collection.find({"url": {"$in": urls[i : i + BATCH_SIZE]}}, projection={"url": 1, "_id": 0})
+                saved_urls.update(document["url"] for document in cursor)
+        except Exception as e:
+            Logger.error("DB", f"Error al obtener los artículos guardados: {e}")
+
+        return saved_urls
+
+    def _update_last_dates(self, articles: List[Article]) -> None:
+        """Move forward the last dates cached with the saved articles, the newspapers not cached yet are read from the database when asked"""
+        for article in articles:
+            if article.date is None or article.newspaper.value not in self._last_dates:
+                continue
+
+            last_date = self._last_dates[article.newspaper.value]
+            if last_date is None or article.date > last_date:
+                self._last_dates[article.newspaper.value] = article.date
+
+    def get_last_dates_saved(self, newspaper_names: List[str]) -> Dict[str, datetime | None]:
+        """Get the last date saved of every newspaper in a single aggregation over the (newspaper, date) index"""
+        missing_names = [name for name in newspaper_names if name not in self._last_dates]
+
+        if len(missing_names) > 0:
+            try:
+                cursor = self.collection.aggregate(
+                    [
+                        {"$match": {"newspaper": {"$in": missing_names}}},
+                        {"$sort": {"newspaper": 1, "date": -1}},
+                        {"$group": {"_id": "$newspaper", "date": {"$first": "$date"}}},
+                    ]
+                )
+                last_dates = {document["_id"]: document["date"] for document in cursor}
+
+                for name in missing_names:
+                    self._last_dates[name] = last_dates.get(name)
+            except Exception as e:
+                Logger.error("DB", f"Error al obtener la fecha de guardado del último artículo guardado de {', '.join(missing_names)}: {e}")
+
+        return {name: self._last_dates.get(name) for name in newspaper_names}
 
     def get_last_date_saved(self, newspaper_name: str) -> datetime | None:
+        if newspaper_name in self._last_dates:
+            return self._last_dates[newspaper_name]
+
         try:
             document = self.collection.find_one(
                 {"newspaper": newspaper_name},
                 sort=[("date", pymongo.DESCENDING)],
             )
 
-            return document["date"] if document else None
+            self._last_dates[newspaper_name] = document["date"] if document else None
+            return self._last_dates[newspaper_name]
         except Exception as e:
             Logger.error("DB", f"Error al obtener la fecha de guardado del último artículo guardado de {newspaper_name}: {e}")
             return None
@@ -1,21 +1,44 @@
+from typing import Any, Dict, Set, Tuple
+
 from pymongo import MongoClient
 
 from utils.logger import Logger
 
 
 class MongoConnection:
-    def __init__(self, url: str, database: str):
+    # Connections shared by the whole process, by url, database and client options
+    _connections: Dict[Tuple, "MongoConnection"] = {}
+
+    def __init__(self, url: str, database: str, **options: Any):
         try:
-            self.client = MongoClient(url)
+            # Options of MongoClient, e.g. maxPoolSize, w, journal, compressors
+            self.client = MongoClient(url, **options)
             self.db = self.client[database]
             Logger.info("DB", f"Conectado a la base de datos MongoDB: {url}")
         except Exception as e:
             Logger.error("DB", f"Error al conectar a la base de datos MongoDB: {e}")
             exit(1)
 
+        # Collections already created and indexed by this connection
+        self.ready_collections: Set[str] = set()
+
+    @classmethod
+    def get(cls, url: str, database: str, **options: Any) -> "MongoConnection":
+        """Get the connection shared by the process, creating it on the first call"""
+        key = (url, database, tuple(sorted(options.items())))
+        if key not in cls._connections:
+            cls._connections[key] = cls(url, database, **options)
+
+        return cls._connections[key]
+
     def close_connection(self) -> None:
         try:
             self.client.close()
             Logger.info("DB", "Conexión cerrada")
         except Exception as e:
             Logger.error("DB", f"Error al cerrar la conexión a la base de datos MongoDB: {e}")
+
+        # A later get creates a new connection
+        for key, connection in list(MongoConnection._connections.items()):
+            if connection is self:
+                del MongoConnection._connections[key]
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 
 from apscheduler.schedulers.blocking import BlockingScheduler
@@ -22,50 +23,89 @@ CRAWLERS_TO_RUN = {
 
 IS_MANUAL = False
 
+# ?: Ejecutar todos los periodicos a la vez en un mismo event loop (cada uno con sus propios limites por host)
+IS_CONCURRENT = True
+
+# ?: Guardar los articulos por bloques a medida que se obtienen, la memoria no depende del rango de fechas
+IS_STREAMING = True
+
 if IS_MANUAL:
     # ?: FORMATO DE FECHAS: DD-MM-YYYY
     START_DATE = "01-01-2025"
     END_DATE = "15-10-2025"
 
-    # ?: Ejecutar el servicio
-    CrawlerService(START_DATE, END_DATE, CRAWLERS_TO_RUN).run(data_storage=DataStorage("EXCEL"))
+    # ?: Ejecutar el servicio (solo en el proceso principal, los procesos de parseo importan este archivo)
+    if __name__ == "__main__":
+        CrawlerService(START_DATE, END_DATE, CRAWLERS_TO_RUN).run(data_storage=DataStorage("EXCEL"), concurrent=IS_CONCURRENT, stream=IS_STREAMING)
 else:
     # ?: MONGODB DATABASE URL & COLLECTION NAME
     MONGO_URI = "mongodb://localhost:27017"  # Your MongoDB connection string
     MONGO_DATABASE = "newspapers"
+    MONGO_BATCH_SIZE = 500  # Upserts by bulk write
+
+    # ?: OPCIONES DEL CLIENTE DE MONGODB (pool de conexiones y compresion)
+    # El write concern queda el del servidor: los checkpoints y la ultima fecha guardada suponen que lo escrito no se pierde
+    MONGO_OPTIONS = {
+        "maxPoolSize": 20,
+        "compressors": "zlib",
+    }
 
     # ?: CRON SCHEDULE DEFINITION
     CRON_SCHEDULE = "0 8 * * *"  # 8:00 AM every day, url for create your own schedule: https://crontab.cronhub.io/
 
-    # TODO: ESTO DEBE ESTAR DENTRO DEL CRON
-    def run_crawler():
-        mongodb_connection = MongoConnection(MONGO_URI, MONGO_DATABASE)
-        articles_table = ArticleTable(mongodb_connection)
+    async def crawl_newspaper(newspaper: str, articles_table: ArticleTable, last_date_saved: datetime | None):
+        START_DATE = last_date_saved if last_date_saved else datetime.strptime("01-01-2000", "%d-%m-%Y")
+        END_DATE = datetime.now()
+
+        # ? Un crawl por bloques guarda los articulos fuera de orden, si se detiene la ultima fecha guardada pasaria por encima de los que faltan.
+        # ? Solo los periodicos con checkpoints, que retoman el rango detenido, se ejecutan en una sola pasada
+        crawler_service = CrawlerService(START_DATE.strftime("%d-%m-%Y"), END_DATE.strftime("%d-%m-%Y"), {newspaper: True})
+        if IS_STREAMING and crawler_service.is_resumable():
+            data_storage = DataStorage("MONGO_DB", articles_table, skip_saved_urls=True)
+            await crawler_service.run_async(data_storage=data_storage, stream=True)
+            # Espera las escrituras pendientes en otro hilo, sin bloquear a los demas newspapers del event loop
+            await asyncio.get_running_loop().run_in_executor(None, data_storage.close)
+            return
 
-        for key, value in CRAWLERS_TO_RUN.items():  # Por cada newspaper activo obtiene su ultima fecha guardada y ejecuta el crawler para solo ese newspaper
-            if value is False:
-                continue
+        TOTAL_DAYS = (END_DATE - START_DATE).days
 
-            last_date_saved = articles_table.get_last_date_saved(key)
-            START_DATE = last_date_saved if last_date_saved else datetime.strptime("01-01-2000", "%d-%m-%Y")
-            END_DATE = datetime.now()
+        # ? En caso que el rango de dias sea mayor a un año, se ejecutará el crawler en bloques de 365 días, con el fin de evitar utilizar mucha memoria e i
+        for offset in range(0, TOTAL_DAYS, 365):
+            batch_start_date = START_DATE + timedelta(days=offset)
+            batch_end_date = min(batch_start_date + timedelta(days=365), END_DATE)
 
-            TOTAL_DAYS = (END_DATE - START_DATE).days
+            # Logger.info("INFO", f"Crawling newspaper {newspaper} from {batch_start_date.strftime('%d-%m-%Y')} to {batch_end_date.strftime('%d-%m-%Y')}")
+            data_storage = DataStorage("MONGO_DB", articles_table, skip_saved_urls=True)
+            await CrawlerService(batch_start_date.strftime("%d-%m-%Y"), batch_end_date.strftime("%d-%m-%Y"), {newspaper: True}).run_async(data_storage=data_storage)
+            await asyncio.get_running_loop().run_in_executor(None, data_storage.close)
 
-            # ? En caso que el rango de dias sea mayor a un año, se ejecutará el crawler en bloques de 365 días, con el fin de evitar utilizar mucha memoria e i
-            for offset in range(0, TOTAL_DAYS, 365):
-                batch_start_date = START_DATE + timedelta(days=offset)
-                batch_end_date = min(batch_start_date + timedelta(days=365), END_DATE)
+            if newspaper == "TVN_ACTUALIDAD" or newspaper == "TVN_NOTICIAS":  # TVN_ACTUALIDAD y NOTICIAS No siguen la logica de rangos de dias, por lo que solo se ejecuta una vez
+                break
 
-                # Logger.info("INFO", f"Crawling newspaper {key} from {batch_start_date.strftime('%d-%m-%Y')} to {batch_end_date.strftime('%d-%m-%Y')}")
-                CrawlerService(batch_start_date.strftime("%d-%m-%Y"), batch_end_date.strftime("%d-%m-%Y"), {key: True}).run(data_storage=DataStorage("MONGO_DB", articles_table))
+    async def crawl_newspapers(articles_table: ArticleTable):
+        newspapers = [key for key, value in CRAWLERS_TO_RUN.items() if value is True]
 
-                if key == "TVN_ACTUALIDAD" or key == "TVN_NOTICIAS":  # TVN_ACTUALIDAD y NOTICIAS No siguen la logica de rangos de dias, por lo que solo se ejecuta una vez
-                    break
+        # Una sola consulta para la ultima fecha guardada de todos los newspapers
+        last_dates_saved = articles_table.get_last_dates_saved(newspapers)
 
-        mongodb_connection.close_connection()
+        if IS_CONCURRENT:
+            await asyncio.gather(*[crawl_newspaper(newspaper, articles_table, last_dates_saved.get(newspaper)) for newspaper in newspapers])
+        else:
+            for newspaper in newspapers:
+                await crawl_newspaper(newspaper, articles_table, last_dates_saved.get(newspaper))
 
-    scheduler = BlockingScheduler()
-    trigger = CronTrigger.from_crontab(CRON_SCHEDULE)
-    scheduler.add_job(run_crawler, trigger)
-    scheduler.start()
+    # TODO: ESTO DEBE ESTAR DENTRO DEL CRON
+    def run_crawler():
+        # La conexion se crea una sola vez y se reutiliza en cada ejecucion del cron
+        mongodb_connection = MongoConnection.get(MONGO_URI, MONGO_DATABASE, **MONGO_OPTIONS)
+        articles_table = ArticleTable(mongodb_connection, batch_size=MONGO_BATCH_SIZE)
+
+        # Por cada newspaper activo obtiene su ultima fecha guardada y ejecuta el crawler para solo ese newspaper
+        asyncio.run(crawl_newspapers(articles_table))
+
+    # Solo en el proceso principal, los procesos de parseo importan este archivo
+    if __name__ == "__main__":
+        scheduler = BlockingScheduler()
+        trigger = CronTrigger.from_crontab(CRON_SCHEDULE)
+        scheduler.add_job(run_crawler, trigger)
+        scheduler.start()
@@ -0,0 +1,127 @@
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.logger import Logger
+
+
+class CheckpointStore:
+    """Progress of the crawls by newspaper, stored in SQLite so a restarted crawl resumes where it stopped"""
+
+    # Item kinds
+    PAGE = "PAGE"
+    ARTICLE = "ARTICLE"
+
+    def __init__(self, db_path: str):
+        self.DB_PATH = db_path
+
+        # The connection is opened on the first use
+        self._conn: sqlite3.Connection | None = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Obtain or create the connection to the checkpoint database"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.DB_PATH)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS crawls (
+                    newspaper TEXT PRIMARY KEY,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL,
+                    started_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS items (
+                    newspaper TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    page TEXT,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (newspaper, kind, url)
+                )
+                """
+            )
+
+        return self._conn
+
+    def get_date_range(self, newspaper: str) -> Optional[Tuple[datetime, datetime]]:
+        """Get the date range of the unfinished crawl of the newspaper, None if there isn't one"""
+        row = self._get_connection().execute("SELECT start_date, end_date FROM crawls WHERE newspaper = ?", (newspaper,)).fetchone()
+        if row is None:
+            return None
+
+        return datetime.fromisoformat(row[0]), datetime.fromisoformat(row[1])
+
+    def start(self, newspaper: str, start_date: datetime, end_date: datetime) -> None:
+        """Save the date range of the crawl of the newspaper, keeping its progress"""
+        conn = self._get_connection()
+        conn.execute(
+            "INSERT INTO crawls (newspaper, start_date, end_date, started_at) VALUES (?, ?, ?, ?) ON CONFLICT (newspaper) DO UPDATE SET start_date = excluded.start_date, end_date = excluded.end_date",
+            (newspaper, start_date.isoformat(), end_date.isoformat(), time.time()),
+        )
+        conn.commit()
+
+    def set_pages(self, newspaper: str, pages: List[str]) -> Dict[str, List[str]]:
+        """Save the listing pages of the crawl, returns the article urls of the ones already done.
+        The pages are only kept when they are the same of the stopped crawl, otherwise their numbers may have shifted"""
+        conn = self._get_connection()
+        saved_pages = {row[0]: row[1] for row in conn.execute("SELECT url, done FROM items WHERE newspaper = ? AND kind = ?", (newspaper, self.PAGE))}
+
+        if set(saved_pages) != set(pages):
+            conn.execute("DELETE FROM items WHERE newspaper = ? AND kind = ?", (newspaper, self.PAGE))
+            conn.executemany("INSERT INTO items (newspaper, kind, url) VALUES (?, ?, ?)", [(newspaper, self.PAGE, page) for page in pages])
+            conn.commit()
+            return {}
+
+        done_pages: Dict[str, List[str]] = {page: [] for page, done in saved_pages.items() if done}
+        for url, page in conn.execute("SELECT url, page FROM items WHERE newspaper = ? AND kind = ? AND page IS NOT NULL", (newspaper, self.ARTICLE)):
+            if page in done_pages:
+                done_pages[page].append(url)
+
+        if len(done_pages) > 0:
+            Logger.info("FILE", f"Reanudando {len(done_pages)} de {len(pages)} páginas de {newspaper}")
+
+        return done_pages
+
+    def mark_page_done(self, newspaper: str, page: str, article_urls: List[str]) -> None:
+        """Mark a listing page as done, saving its article urls as pending"""
+        conn = self._get_connection()
+        conn.executemany("INSERT OR IGNORE INTO items (newspaper, kind, url, page) VALUES (?, ?, ?, ?)", [(newspaper, self.ARTICLE, url, page) for url in article_urls])
+        conn.execute("UPDATE items SET done = 1 WHERE newspaper = ? AND kind = ? AND url = ?", (newspaper, self.PAGE, page))
+        conn.commit()
+
+    def get_done_articles(self, newspaper: str) -> Set[str]:
+        """Get the article urls already saved, or discarded, by the stopped crawl"""
+        rows = self._get_connection().execute("SELECT url FROM items WHERE newspaper = ? AND kind = ? AND done = 1", (newspaper, self.ARTICLE))
+        return {row[0] for row in rows}
+
+    def mark_articles_done(self, newspaper: str, urls: List[str]) -> None:
+        """Mark the article urls as done"""
+        if len(urls) == 0:
+            return
+
+        conn = self._get_connection()
+        conn.executemany(
+            "INSERT INTO items (newspaper, kind, url, done) VALUES (?, ?, ?, 1) ON CONFLICT (newspaper, kind, url) DO UPDATE SET done = 1",
+            [(newspaper, self.ARTICLE, url) for url in urls],
+        )
+        conn.commit()
+
+    def finish(self, newspaper: str) -> None:
+        """Remove the checkpoint of a finished crawl"""
+        conn = self._get_connection()
+        conn.execute("DELETE FROM items WHERE newspaper = ?", (newspaper,))
+        conn.execute("DELETE FROM crawls WHERE newspaper = ?", (newspaper,))
+        conn.commit()
+
+    def close(self) -> None:
+        """Close the connection to the checkpoint database"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
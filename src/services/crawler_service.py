@@ -1,7 +1,8 @@
 import asyncio
 import math
 import time
-from typing import List
+from typing import List, Set, Tuple
+from urllib.parse import urlparse
 
 import yaml
 
@@ -68,18 +69,93 @@ class CrawlerService:
         # Set stats
         self.stats = []
 
-    def run(self, data_storage: DataStorage) -> None:
+    def is_resumable(self) -> bool:
+        """Whether every crawler resumes a stopped crawl from its checkpoint, so its articles can be saved in any order"""
+        return all(crawler.CHECKPOINTS is not None for crawler in self.crawlers)
+
+    def run(self, data_storage: DataStorage, concurrent: bool = False, stream: bool = False) -> None:
+        if concurrent:
+            asyncio.run(self.run_async(data_storage, stream))
+            data_storage.close()
+            return
+
+        for crawler in self.crawlers:
+            stat = asyncio.run(self._run_crawler(crawler, data_storage, stream))
+            self.stats.append(stat)
+
+        data_storage.close()
+        self._print_stats()
+
+    async def run_async(self, data_storage: DataStorage, stream: bool = False) -> None:
+        """Run the crawlers concurrently in the current event loop, the ones of the same host one after the other"""
+        groups = self._group_by_host()
+        tasks = [self._run_crawlers_in_order(group, data_storage, stream) for group in groups]
+        results = await asyncio.gather(*tasks)
+
+        for crawler, result in zip([crawler for group in groups for crawler in group], [result for group_results in results for result in group_results]):
+            if isinstance(result, Exception):
+                Logger.error(prefix="ERROR", message=f"{crawler.NAME.value}: {result}")
+                continue
+
+            self.stats.append(result)
+
+        self._print_stats()
+
+    def _group_by_host(self) -> List[List[BaseCrawler]]:
+        """Group the crawlers that request a same host, so they don't add up their request limits"""
+        groups: List[Tuple[Set[str], List[BaseCrawler]]] = []
         for crawler in self.crawlers:
-            start_time = time.time()
-            articles = asyncio.run(crawler.crawl())
+            hosts = {urlparse(base_url).netloc for base_url in crawler.BASE_URLS or []}
+            shared_groups = [group for group in groups if not group[0].isdisjoint(hosts)]
+
+            for group in shared_groups:
+                groups.remove(group)
+                hosts |= group[0]
+
+            groups.append((hosts, [group_crawler for group in shared_groups for group_crawler in group[1]] + [crawler]))
+
+        return [group_crawlers for _, group_crawlers in groups]
+
+    async def _run_crawlers_in_order(self, crawlers: List[BaseCrawler], data_storage: DataStorage, stream: bool) -> List[dict | Exception]:
+        results: List[dict | Exception] = []
+        for crawler in crawlers:
+            try:
+                results.append(await self._run_crawler(crawler, data_storage, stream))
+            except Exception as e:
+                results.append(e)
+
+        return results
+
+    async def _run_crawler(self, crawler: BaseCrawler, data_storage: DataStorage, stream: bool = False) -> dict:
+        # Without a filter the crawlers don't expect saved urls to be removed (e.g. the early stop of TVN)
+        crawler.url_filter = data_storage.filter_new_urls if data_storage.filters_saved_urls else None
+        crawler.article_mode = data_storage.article_mode
+
+        start_time = time.time()
+        if stream:
+            # Articles are saved in chunks while crawling, so the time includes the storage
+            total_articles, all_saved = await data_storage.save_stream(crawler.crawl_stream(), self.date_range, crawler.on_articles_saved)
             end_time = time.time()
 
             Logger.info("TIMER", f"{crawler.NAME.value}: {self._print_time(end_time - start_time)}")
 
-            self.stats.append({"site_name": crawler.NAME.value, "articles": len(articles), "time": end_time - start_time})
-            asyncio.run(data_storage.save_articles(articles, self.date_range))
+            # A chunk that wasn't saved keeps its articles pending for the next run
+            if all_saved:
+                data_storage.after_saved(crawler.on_crawl_saved)
+            else:
+                Logger.error("STORAGE", f"{crawler.NAME.value}: no se guardaron todos los artículos, el crawl queda pendiente")
+        else:
+            articles = await crawler.crawl()
+            end_time = time.time()
+            total_articles = len(articles)
 
-        self._print_stats()
+            Logger.info("TIMER", f"{crawler.NAME.value}: {self._print_time(end_time - start_time)}")
+
+            if await data_storage.save_articles(articles, self.date_range):
+                data_storage.after_saved(lambda: crawler.on_articles_saved(articles))
+                data_storage.after_saved(crawler.on_crawl_saved)
+
+        return {"site_name": crawler.NAME.value, "articles": total_articles, "time": end_time - start_time}
 
     def _print_time(self, time: float) -> str:
         hours = math.floor(time / 3600)
@@ -1,15 +1,20 @@
-from typing import List
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Set, Tuple
 
 from core.models import Article, DateRange
 from db.article_table import ArticleTable
-from services.excel_exporter import ExcelExporter
+from services.excel_exporter import ExcelWriter
+from services.jsonl_exporter import JsonlWriter
+from services.parquet_exporter import ParquetWriter
 from utils.file_utils import FileUtils
 from utils.logger import Logger
 
 
 class DataStorage:
-    def __init__(self, storage_mode: str, db_table: ArticleTable | None = None):
-        if storage_mode not in ["EXCEL", "MONGO_DB"]:
+    def __init__(self, storage_mode: str, db_table: ArticleTable | None = None, chunk_size: int = 500, skip_saved_urls: bool = False, max_pending_writes: int = 2, article_mode: str = Article.FULL):
+        if storage_mode not in ["EXCEL", "MONGO_DB", "PARQUET", "JSONL"]:
             Logger.error("STORAGE", f"Storage mode [{storage_mode}] not supported")
             exit(1)
 
@@ -17,43 +22,228 @@ class DataStorage:
 
         self.db_table = db_table
 
-    async def save_articles(self, articles: List[Article], date_range: DateRange) -> None:
+        # Max number of articles kept in memory when saving a stream
+        self.chunk_size = chunk_size
+
+        # Don't fetch again the articles that are already in the database
+        self.skip_saved_urls = skip_saved_urls
+
+        # Max number of chunks being written while the stream keeps crawling
+        self.max_pending_writes = max_pending_writes
+
+        # How the crawlers keep the body of the articles until they are saved (FULL, COMPRESSED or NO_HTML)
+        if article_mode not in [Article.FULL, Article.COMPRESSED, Article.NO_HTML]:
+            Logger.error("STORAGE", f"Article mode [{article_mode}] not supported")
+            exit(1)
+        self.article_mode = article_mode
+
+        # The blocking writes (pymongo, openpyxl) run in order in a dedicated thread, outside the event loop
+        self._writer: ThreadPoolExecutor | None = None
+
+        # Files kept open while crawling (Excel, Parquet and JSONL writers), by file name
+        self._file_writers: Dict[str, Any] = {}
+
+        # Callbacks waiting for the saved articles to be on disk, with the files they were written to
+        self._pending_callbacks: List[Tuple[Callable[[], None], Set[str]]] = []
+
+        # Files whose writer failed to close, their articles may not be on disk
+        self._unsaved_files: Set[str] = set()
+
+    async def _run_in_writer(self, fn: Callable, *args):
+        """Run a blocking storage call in the writer thread"""
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-writer")
+
+        return await asyncio.get_running_loop().run_in_executor(self._writer, fn, *args)
+
+    def close(self) -> None:
+        """Wait for the pending writes, stop the writer thread and write the Excel files"""
+        if self._writer is not None:
+            # The files are written by the same thread that appended their rows
+            self._writer.submit(self._close_file_writers)
+            self._writer.shutdown(wait=True)
+            self._writer = None
+
+        self._close_file_writers()
+
+        # Only the callbacks of the files that were closed cleanly, the others stay pending for the next run
+        for callback, file_names in self._pending_callbacks:
+            if file_names.isdisjoint(self._unsaved_files):
+                callback()
+        self._pending_callbacks = []
+        self._unsaved_files = set()
+
+    def _close_file_writers(self) -> None:
+        for file_name, file_writer in self._file_writers.items():
+            try:
+                file_writer.close()
+            except Exception as e:
+                Logger.error("FILE", f"Error closing the export file {file_name}: {e}")
+                self._unsaved_files.add(file_name)
+        self._file_writers = {}
+
+    def _get_file_writer(self, file_name: str, create_writer: Callable[[str], Any]) -> Any:
+        """Get the open writer of the file, creating it inside the newspapers folder"""
+        file_writer = self._file_writers.get(file_name)
+        if file_writer is None:
+            folder_path = FileUtils.create_folder("newspapers")
+            file_writer = create_writer(os.path.join(folder_path, file_name))
+            self._file_writers[file_name] = file_writer
+
+        return file_writer
+
+    def after_saved(self, callback: Callable[[], None]) -> None:
+        """Run the callback once the articles saved until now are on disk, for Excel and Parquet when the files are closed"""
+        if self.storage_mode in ["EXCEL", "PARQUET"]:
+            self._pending_callbacks.append((callback, set(self._file_writers)))
+        else:
+            callback()
+
+    async def save_articles(self, articles: List[Article], date_range: DateRange) -> bool:
+        """Save the articles, returns False if they couldn't be saved"""
         if self.storage_mode == "EXCEL":
-            self._save_articles_to_excel(articles, date_range)
+            return await self._run_in_writer(self._save_articles_to_excel, articles, date_range)
         elif self.storage_mode == "MONGO_DB":
-            self._save_articles_to_mongo(articles)
+            return await self._run_in_writer(self._save_articles_to_mongo, articles)
+        elif self.storage_mode == "PARQUET":
+            return await self._run_in_writer(self._save_articles_to_parquet, articles, date_range)
+        elif self.storage_mode == "JSONL":
+            return await self._run_in_writer(self._save_articles_to_jsonl, articles, date_range)
+
+        return False
+
+    @property
+    def filters_saved_urls(self) -> bool:
+        """Whether filter_new_urls removes the saved urls, only with skip_saved_urls and a database"""
+        return self.skip_saved_urls and self.storage_mode == "MONGO_DB" and self.db_table is not None
+
+    async def filter_new_urls(self, urls: List[str]) -> List[str]:
+        """Remove the article urls that are already saved, only when skip_saved_urls is enabled"""
+        if not self.filters_saved_urls:
+            return urls
+
+        saved_urls = await self._run_in_writer(self.db_table.get_saved_urls, urls)
+        if len(saved_urls) > 0:
+            Logger.info("DB", f"Omitiendo {len(saved_urls)} artículos ya guardados")
+
+        return [url for url in urls if url not in saved_urls]
+
+    async def save_stream(self, articles: AsyncIterator[Article], date_range: DateRange, on_saved: Callable[[List[Article]], None] | None = None) -> Tuple[int, bool]:
+        """Consume a stream of articles saving them in chunks of chunk_size, returns the number of articles and whether all the chunks were saved.
+        The chunks are written while the stream keeps going, on_saved is called with every chunk once it is saved"""
+        total_articles = 0
+        chunk = []
+        pending_writes: Set[asyncio.Future] = set()
+        saved_chunks: List[bool] = []
 
-    def _save_articles_to_excel(self, articles: List[Article], date_range: DateRange) -> None:
+        try:
+            async for article in articles:
+                chunk.append(article)
+                if len(chunk) >= self.chunk_size:
+                    pending_writes.add(asyncio.ensure_future(self._save_chunk(chunk, date_range, on_saved)))
+                    total_articles += len(chunk)
+                    chunk = []
+
+                    # Backpressure, don't keep more than max_pending_writes chunks in memory
+                    if len(pending_writes) >= self.max_pending_writes:
+                        done, pending_writes = await asyncio.wait(pending_writes, return_when=asyncio.FIRST_COMPLETED)
+                        saved_chunks.extend(self._get_saved_chunks(done))
+
+            if len(chunk) > 0 or total_articles == 0:
+                pending_writes.add(asyncio.ensure_future(self._save_chunk(chunk, date_range, on_saved)))
+                total_articles += len(chunk)
+        finally:
+            # The chunks already crawled are saved even if the stream fails
+            if len(pending_writes) > 0:
+                done, _ = await asyncio.wait(pending_writes)
+                saved_chunks.extend(self._get_saved_chunks(done))
+
+        return total_articles, all(saved_chunks)
+
+    async def _save_chunk(self, chunk: List[Article], date_range: DateRange, on_saved: Callable[[List[Article]], None] | None) -> bool:
+        saved = await self.save_articles(chunk, date_range)
+        if saved and on_saved is not None:
+            self.after_saved(lambda: on_saved(chunk))
+
+        return saved
+
+    @staticmethod
+    def _get_saved_chunks(writes: Set[asyncio.Future]) -> List[bool]:
+        """Whether each finished chunk write was saved, a write that raised counts as not saved"""
+        saved_chunks = []
+        for write in writes:
+            try:
+                saved_chunks.append(write.result())
+            except Exception as e:
+                Logger.error("STORAGE", f"Error saving a chunk of articles: {e}")
+                saved_chunks.append(False)
+
+        return saved_chunks
+
+    def _save_articles_to_excel(self, articles: List[Article], date_range: DateRange) -> bool:
         print()
         if len(articles) == 0:
             Logger.info("INFO", "No se encontraron artículos")
-            return
+            return True
 
         try:
-            folder_path = FileUtils.create_folder("newspapers")
-            ExcelExporter.export(
-                articles,
-                f"newspapers_{date_range.start_date.strftime('%d-%m-%Y')}_to_{date_range.end_date.strftime('%d-%m-%Y')}.xlsx",
-                folder_path,
-            )
+            file_name = f"newspapers_{date_range.start_date.strftime('%d-%m-%Y')}_to_{date_range.end_date.strftime('%d-%m-%Y')}.xlsx"
+            self._get_file_writer(file_name, ExcelWriter).append(articles)
+            Logger.info("FILE", f"{len(articles)} articles written to {file_name}")
         except Exception as e:
             Logger.error("FILE", f"Error exporting articles to Excel: {e}")
+            return False
 
         print("-------------------------------------------------------------------")
+        return True
+
+    def _save_articles_to_parquet(self, articles: List[Article], date_range: DateRange) -> bool:
+        if len(articles) == 0:
+            Logger.info("INFO", "No se encontraron artículos")
+            return True
+
+        try:
+            file_prefix = f"newspapers_{date_range.start_date.strftime('%d-%m-%Y')}_to_{date_range.end_date.strftime('%d-%m-%Y')}"
+            self._get_file_writer("parquet", lambda folder_path: ParquetWriter(folder_path, file_prefix)).append(articles)
+        except Exception as e:
+            Logger.error("FILE", f"Error exporting articles to Parquet: {e}")
+            # The failed row group or closed partition may hold rows of the chunks already reported as saved
+            self._unsaved_files.add("parquet")
+            return False
+
+        return True
+
+    def _save_articles_to_jsonl(self, articles: List[Article], date_range: DateRange) -> bool:
+        if len(articles) == 0:
+            Logger.info("INFO", "No se encontraron artículos")
+            return True
+
+        try:
+            file_name = f"newspapers_{date_range.start_date.strftime('%d-%m-%Y')}_to_{date_range.end_date.strftime('%d-%m-%Y')}.jsonl.zst"
+            self._get_file_writer(file_name, JsonlWriter).append(articles)
+            Logger.info("FILE", f"{len(articles)} articles written to {file_name}")
+        except Exception as e:
+            Logger.error("FILE", f"Error exporting articles to JSONL: {e}")
+            return False
+
+        return True
 
-    def _save_articles_to_mongo(self, articles: List[Article]) -> None:
+    def _save_articles_to_mongo(self, articles: List[Article]) -> bool:
         print()
         if self.db_table is None:
             Logger.error("DB", "No se ha podido conectar a la base de datos")
-            return
+            return False
 
         if len(articles) == 0:
             Logger.info("INFO", "No se encontraron artículos")
-            return
+            return True
 
         try:
-            self.db_table.save_articles(articles)
+            if not self.db_table.save_articles(articles):
+                return False
         except Exception as e:
             Logger.error("DB", f"Error al guardar los artículos en la base de datos: {e}")
+            return False
 
         print("-------------------------------------------------------------------")
+        return True
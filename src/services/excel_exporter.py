@@ -1,9 +1,10 @@
 import os
 import re
 from datetime import datetime
-from typing import List
+from typing import Dict, List
 
 from openpyxl import Workbook, load_workbook
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 
 from core.models import Article
 from utils.logger import Logger
@@ -27,45 +28,82 @@ class ExcelExporter:
         if not articles:
             Logger.info("FILE", "Don't found any article to export")
             return
-        
-        file_path = os.path.join(folder_path, file_name)
 
-        
-        try:
-            wb = load_workbook(file_path)
-        except Exception:
-            wb = Workbook()
-            # Remove a default sheet
-            if "Sheet" in wb.sheetnames:
-                wb.remove(wb["Sheet"])
-
-        sheet_name = articles[0].newspaper.value
-
-        if sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-        else:
-            ws = wb.create_sheet(title=sheet_name)
-            ws.append(["Newspaper", "URL", "Titulo", "Autor/Autores", "Fecha", "Tag", "Bajada", "Cuerpo", "Cuerpo HTML"])
-        
-        articles_sorted = sorted(articles, key=lambda p: p.date or datetime.min)
-
-        for article in articles_sorted:
-            ws.append(
-                [
-                    article.newspaper.value,
-                    article.url,
-                    ExcelExporter._clean_text_to_excel(article.title) or "",
-                    ExcelExporter._clean_text_to_excel(article.author) or "",
-                    article.date.strftime("%d-%m-%Y") if article.date else "",
-                    ExcelExporter._clean_text_to_excel(article.tag) or "",
-                    ExcelExporter._clean_text_to_excel(article.drophead) or "",
-                    ExcelExporter._clean_text_to_excel(article.body) or "",
-                    ExcelExporter._clean_text_to_excel(article.body_html) or "",
-                ]
-            )
+        writer = ExcelWriter(os.path.join(folder_path, file_name))
+        writer.append(articles)
+        writer.close()
+
+    @staticmethod
+    def _get_row(article: Article) -> List[str]:
+        return [
+            article.newspaper.value,
+            article.url,
+            ExcelExporter._clean_text_to_excel(article.title) or "",
+            ExcelExporter._clean_text_to_excel(article.author) or "",
+            article.date.strftime("%d-%m-%Y") if article.date else "",
+            ExcelExporter._clean_text_to_excel(article.tag) or "",
+            ExcelExporter._clean_text_to_excel(article.drophead) or "",
+            ExcelExporter._clean_text_to_excel(article.body) or "",
+            ExcelExporter._clean_text_to_excel(article.body_html) or "",
+        ]
+
+
+class ExcelWriter:
+    """Excel file written as the articles arrive with a write-only workbook, one sheet by newspaper"""
+
+    HEADER = ["Newspaper", "URL", "Titulo", "Autor/Autores", "Fecha", "Tag", "Bajada", "Cuerpo", "Cuerpo HTML"]
+
+    def __init__(self, file_path: str):
+        self.FILE_PATH = file_path
+
+        # The workbook is created on the first append, the rows are kept in temporary files until close
+        self._workbook: Workbook | None = None
+        self._sheets: Dict[str, WriteOnlyWorksheet] = {}
+
+    def _open(self) -> None:
+        self._workbook = Workbook(write_only=True)
+
+        if not os.path.exists(self.FILE_PATH):
+            return
 
+        # Copy the existing file once, reading it row by row
         try:
-            wb.save(file_path)
-            Logger.info("FILE", f"Articles exported satisfactorily to {file_name}")
+            source = load_workbook(self.FILE_PATH, read_only=True)
         except Exception as e:
-            Logger.error("FILE", f"Error exporting articles to Excel: {e}")
+            Logger.error("FILE", f"Error reading {self.FILE_PATH}, it will be replaced: {e}")
+            return
+
+        for sheet_name in source.sheetnames:
+            ws = self._workbook.create_sheet(title=sheet_name)
+            for row in source[sheet_name].iter_rows(values_only=True):
+                ws.append(row)
+            self._sheets[sheet_name] = ws
+
+        source.close()
+
+    def append(self, articles: List[Article]) -> None:
+        """Write the articles, sorted by date, in the sheet of their newspaper"""
+        if self._workbook is None:
+            self._open()
+
+        for article in sorted(articles, key=lambda p: p.date or datetime.min):
+            sheet_name = article.newspaper.value
+            ws = self._sheets.get(sheet_name)
+            if ws is None:
+                ws = self._workbook.create_sheet(title=sheet_name)
+                ws.append(self.HEADER)
+                self._sheets[sheet_name] = ws
+
+            ws.append(ExcelExporter._get_row(article))
+
+    def close(self) -> None:
+        """Save the file, a write-only workbook can only be saved once. Raises if the file couldn't be saved"""
+        if self._workbook is None:
+            return
+
+        try:
+            self._workbook.save(self.FILE_PATH)
+            Logger.info("FILE", f"Articles exported satisfactorily to {os.path.basename(self.FILE_PATH)}")
+        finally:
+            self._workbook = None
+            self._sheets = {}
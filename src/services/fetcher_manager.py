@@ -1,9 +1,12 @@
 import asyncio
 import json
-from typing import Any, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
 
 from aiohttp import ClientSession, ClientTimeout, TCPConnector
 
+from services.response_cache import ResponseCache
+from services.host_limit import HostLimit
 from utils.logger import Logger
 from utils.user_agent import UserAgent
 
@@ -11,14 +14,15 @@ from utils.user_agent import UserAgent
 class FetcherManager:
     """Manager for fetchers"""
 
-    def __init__(self, max_retries: int = 3, retry_delay: int = 5, timeout: int = 30, max_concurrent: int = 15):
+    def __init__(self, max_retries: int = 3, retry_delay: int = 5, timeout: int = 30, max_concurrent: int = 15, requests_per_minute: int | None = None, cache: ResponseCache | None = None):
         self.MAX_RETRIES = max_retries
         self.RETRY_DELAY = retry_delay
         self.TIMEOUT = timeout
         self.MAX_CONCURRENT = max_concurrent
+        self.REQUESTS_PER_MINUTE = requests_per_minute
 
-        # config concurrent requests
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # config an optional on-disk cache of responses
+        self.cache = cache
 
         # config a session
         self._session: ClientSession | None = None
@@ -33,18 +37,48 @@ class FetcherManager:
 
         return self._session
 
-    async def fetch_html(self, url: str, **kwargs) -> Tuple[Optional[str], Optional[int]]:
+    def _get_host_limit(self, url: str) -> HostLimit:
+        """Get the concurrency and rate limit of the host of the url, shared with the other fetchers of the host"""
+        return HostLimit.get(urlparse(url).netloc, self.MAX_CONCURRENT, self.REQUESTS_PER_MINUTE)
+
+    async def _get_headers(self, cache_key: str, kwargs: Dict[str, Any]) -> Dict[str, str]:
+        """Get the headers of the request with the conditional ones (If-None-Match / If-Modified-Since) of the cached response"""
+        headers = dict(kwargs.get("headers") or {})
+        if self.cache is not None:
+            headers.update(await self.cache.get_validators(cache_key))
+
+        return headers
+
+    async def fetch_html(self, url: str, url_class: str = ResponseCache.PAGE, **kwargs) -> Tuple[Optional[str], Optional[int]]:
         """Fetch the url and return the response, status code and exception"""
+        cache_key = ResponseCache.get_key(url, kwargs)
+        if self.cache is not None:
+            html = await self.cache.get(cache_key)
+            if html is not None:
+                return html, 200
+
         for attempt in range(self.MAX_RETRIES):
-            async with self.semaphore:
+            host_limit = self._get_host_limit(url)
+            await host_limit.wait_for_token()
+            async with host_limit.semaphore:
                 try:
                     session = await self._get_session()
-                    async with session.get(url, **kwargs) as response:
+                    headers = await self._get_headers(cache_key, kwargs)
+                    async with session.get(url, **{**kwargs, "headers": headers}) as response:
                         if response.status == 200:
                             html = await response.text(encoding="utf-8", errors="replace")
+                            if self.cache is not None:
+                                await self.cache.set(cache_key, html, url_class, response.headers.get("ETag"), response.headers.get("Last-Modified"))
 
                             Logger.info(prefix="SUCCESS", message=f"[{response.status}] fetch for URL: {url}")
                             return html, response.status
+                        elif response.status == 304 and self.cache is not None:
+                            html = await self.cache.revalidate(cache_key, url_class)
+                            if html is None:
+                                continue
+
+                            Logger.info(prefix="SUCCESS", message=f"[{response.status}] not modified for URL: {url}")
+                            return html, 200
                         elif response.status == 404:
                             Logger.error("ERROR", f"[404] not found for URL: {url}")
                             return None, 404
@@ -60,16 +94,27 @@ class FetcherManager:
         Logger.error("TIMER", f"Number of attempts exceeded for URL: {url}")
         return None, None
 
-    async def fetch_json(self, url: str, **kwargs) -> Tuple[Optional[Any], Optional[int]]:
+    async def fetch_json(self, url: str, url_class: str = ResponseCache.PAGE, **kwargs) -> Tuple[Optional[Any], Optional[int]]:
         """Fetch the url and return the response, status code and exception"""
+        cache_key = ResponseCache.get_key(url, kwargs)
+        if self.cache is not None:
+            cached_json = await self.cache.get(cache_key)
+            if cached_json is not None:
+                return json.loads(cached_json), 200
+
         for attempt in range(self.MAX_RETRIES):
-            async with self.semaphore:
+            host_limit = self._get_host_limit(url)
+            await host_limit.wait_for_token()
+            async with host_limit.semaphore:
                 try:
                     session = await self._get_session()
-                    async with session.get(url, **kwargs) as response:
+                    headers = await self._get_headers(cache_key, kwargs)
+                    async with session.get(url, **{**kwargs, "headers": headers}) as response:
                         if response.status == 200:
                             try:
                                 json_data = await response.json()
+                                if self.cache is not None:
+                                    await self.cache.set(cache_key, json.dumps(json_data), url_class, response.headers.get("ETag"), response.headers.get("Last-Modified"))
 
                                 Logger.info(prefix="SUCCESS", message=f"[{response.status}] fetch for URL: {url}")
                                 return json_data, response.status
@@ -79,6 +124,13 @@ class FetcherManager:
                             except Exception as e:
                                 Logger.error("ERROR", f"Error to fetch JSON for URL: {url} [Error: {e}]")
                                 return None, response.status
+                        elif response.status == 304 and self.cache is not None:
+                            cached_json = await self.cache.revalidate(cache_key, url_class)
+                            if cached_json is None:
+                                continue
+
+                            Logger.info(prefix="SUCCESS", message=f"[{response.status}] not modified for URL: {url}")
+                            return json.loads(cached_json), 200
                         elif response.status == 404:
                             Logger.error("ERROR", f"[404] not found for URL: {url}")
                             return None, 404
@@ -99,6 +151,9 @@ class FetcherManager:
         if self._session and not self._session.closed:
             await self._session.close()
 
+        if self.cache is not None:
+            await self.cache.close()
+
     async def __aenter__(self):
         """Context manager async entry"""
         return self
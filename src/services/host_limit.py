@@ -0,0 +1,39 @@
+import asyncio
+from typing import Dict
+from weakref import WeakKeyDictionary
+
+from services.token_bucket import TokenBucket
+
+
+class HostLimit:
+    """Concurrency and rate limit of a host, shared by all the fetchers that request it"""
+
+    # Limits shared by the whole process, by event loop (asyncio primitives can't be used by other loops) and host
+    _limits: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, HostLimit]]" = WeakKeyDictionary()
+
+    def __init__(self, max_concurrent: int, requests_per_minute: int | None = None):
+        self.MAX_CONCURRENT = max_concurrent
+        self.REQUESTS_PER_MINUTE = requests_per_minute
+
+        # config concurrent requests
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+        # config rate of requests, None without limit
+        self.bucket: TokenBucket | None = None
+        if requests_per_minute is not None:
+            rate = requests_per_minute / 60
+            self.bucket = TokenBucket(rate=rate, capacity=max(rate, 1))
+
+    @classmethod
+    def get(cls, host: str, max_concurrent: int, requests_per_minute: int | None = None) -> "HostLimit":
+        """Get the limit of the host shared by the event loop, creating it with these settings on the first call"""
+        limits = cls._limits.setdefault(asyncio.get_running_loop(), {})
+        if host not in limits:
+            limits[host] = cls(max_concurrent, requests_per_minute)
+
+        return limits[host]
+
+    async def wait_for_token(self) -> None:
+        """Wait for the rate limit of the host"""
+        if self.bucket is not None:
+            await self.bucket.acquire()
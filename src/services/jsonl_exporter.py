@@ -0,0 +1,59 @@
+import json
+import os
+from typing import Any, List
+
+from core.models import Article
+from utils.logger import Logger
+
+
+class JsonlWriter:
+    """JSON lines file compressed with zstd, one article by line, appended as the articles arrive"""
+
+    def __init__(self, file_path: str, level: int = 10):
+        self.FILE_PATH = file_path
+
+        # zstandard is only needed for this storage mode
+        import zstandard
+
+        self._compressor = zstandard.ZstdCompressor(level=level)
+
+        # The file is opened on the first append
+        self._file: Any = None
+        self._stream: Any = None
+
+    def append(self, articles: List[Article]) -> None:
+        """Write the articles and close their zstd frame, so the file is readable after every chunk"""
+        import zstandard
+
+        if self._stream is None:
+            # An existing file gets new frames, zstd reads concatenated frames as a single stream
+            self._file = open(self.FILE_PATH, "ab")
+            self._stream = self._compressor.stream_writer(self._file, closefd=False)
+
+        for article in articles:
+            document = {
+                "url": article.url,
+                "newspaper": article.newspaper.value,
+                "title": article.title,
+                "author": article.author,
+                "date": article.date.isoformat() if article.date else None,
+                "tag": article.tag,
+                "drophead": article.drophead,
+                "body": article.body,
+                "body_html": article.body_html,
+            }
+            self._stream.write(json.dumps(document, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        self._stream.flush(zstandard.FLUSH_FRAME)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._stream is None:
+            return
+
+        self._stream.close()
+        self._file.close()
+        self._stream = None
+        self._file = None
+        Logger.info("FILE", f"Articles exported satisfactorily to {os.path.basename(self.FILE_PATH)}")
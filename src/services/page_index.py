@@ -0,0 +1,79 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.date_utils import DateUtils
+from utils.logger import Logger
+
+
+class PageIndex:
+    """Dates of the listing pages seen in previous crawls, stored as JSON by base url"""
+
+    def __init__(self, file_path: str, margin: int = 2, max_points: int = 500):
+        self.FILE_PATH = file_path
+        self.MARGIN = margin  # pages between a prediction and the first bound checked at the side of the target
+        self.MAX_POINTS = max_points  # points kept by base url, the newest observed
+
+        # The file is read on the first use
+        self._index: Dict[str, List[List[Any]]] | None = None
+
+    def _get_index(self) -> Dict[str, List[List[Any]]]:
+        """Obtain or load the index from its file"""
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.FILE_PATH):
+                try:
+                    with open(self.FILE_PATH, "r", encoding="utf-8") as file:
+                        self._index = json.load(file)
+                except (OSError, ValueError) as e:
+                    Logger.error("FILE", f"Error al leer el índice de páginas {self.FILE_PATH}: {e}")
+
+        return self._index
+
+    def predict(self, base_url: str, target_date: datetime, total_pages: int) -> Optional[int]:
+        """Predict the page with target_date as last date, None if the index has no points of the base url"""
+        newer_point: Tuple[int, datetime] | None = None
+        older_point: Tuple[int, datetime] | None = None
+
+        # Each point is [page, last date, observed at, total pages], shifted by the pages published since then
+        for page, date_str, _, point_total_pages in self._get_index().get(base_url, []):
+            shifted_page = page + total_pages - point_total_pages
+            date = datetime.fromisoformat(date_str)
+            if date >= target_date and (newer_point is None or shifted_page > newer_point[0]):
+                newer_point = (shifted_page, date)
+            if date <= target_date and (older_point is None or shifted_page < older_point[0]):
+                older_point = (shifted_page, date)
+
+        if newer_point is None and older_point is None:
+            return None
+        if newer_point is None:
+            return older_point[0]
+        if older_point is None:
+            return newer_point[0]
+
+        # Between the nearest points at each side of the target
+        if older_point[0] <= newer_point[0] + 1:
+            return older_point[0] if older_point[1] == target_date else newer_point[0]
+
+        return DateUtils.interpolate_position(target_date, newer_point[0], older_point[0], newer_point[1], older_point[1])
+
+    def update(self, base_url: str, total_pages: int, page_dates: Dict[int, datetime]) -> None:
+        """Add the last dates of the pages seen in this crawl, replacing the old points of the same pages"""
+        observed_at = datetime.now().isoformat()
+        new_points = [[page, date.isoformat(), observed_at, total_pages] for page, date in sorted(page_dates.items())]
+
+        old_points = [point for point in self._get_index().get(base_url, []) if point[0] + total_pages - point[3] not in page_dates]
+        points = sorted(new_points + old_points, key=lambda point: point[2], reverse=True)
+
+        self._get_index()[base_url] = points[: self.MAX_POINTS]
+
+    def save(self) -> None:
+        """Write the index to its file"""
+        if self._index is None:
+            return
+
+        temp_path = f"{self.FILE_PATH}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self._index, file)
+        os.replace(temp_path, self.FILE_PATH)
@@ -0,0 +1,119 @@
+import os
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from core.models import Article
+from utils.logger import Logger
+
+
+class ParquetWriter:
+    """Parquet dataset partitioned by newspaper/year/month, written in row groups as the articles arrive"""
+
+    COLUMNS = ["url", "title", "author", "date", "tag", "drophead", "body", "body_html"]
+
+    def __init__(self, folder_path: str, file_prefix: str, row_group_size: int = 1000, max_open_files: int = 16):
+        self.FOLDER_PATH = folder_path
+        self.FILE_PREFIX = file_prefix
+        self.ROW_GROUP_SIZE = row_group_size
+        self.MAX_OPEN_FILES = max_open_files  # partitions with an open file or buffered rows, the least recently used is closed
+
+        # pyarrow is only needed for this storage mode
+        import pyarrow as pa
+
+        self._schema = pa.schema(
+            [
+                ("url", pa.string()),
+                ("title", pa.string()),
+                ("author", pa.string()),
+                ("date", pa.timestamp("ms")),
+                ("tag", pa.string()),
+                ("drophead", pa.string()),
+                ("body", pa.string()),
+                ("body_html", pa.string()),
+            ]
+        )
+
+        # Open file and rows waiting for a full row group, by partition
+        self._writers: Dict[Tuple[str, int, int], Any] = {}
+        self._rows: Dict[Tuple[str, int, int], List[Dict[str, Any]]] = {}
+
+        # Partitions in use, from the least to the most recently written
+        self._partitions: OrderedDict[Tuple[str, int, int], None] = OrderedDict()
+        self._files_written = 0
+
+    def append(self, articles: List[Article]) -> None:
+        """Add the articles to the row group of their partition, writing the full ones"""
+        for article in articles:
+            if article.date is None:
+                Logger.error("FILE", f"Article without date, it can't be partitioned: {article.url}")
+                continue
+
+            partition = (article.newspaper.value, article.date.year, article.date.month)
+            self._use_partition(partition)
+            rows = self._rows.setdefault(partition, [])
+            rows.append({column: getattr(article, column) for column in self.COLUMNS})
+
+            if len(rows) >= self.ROW_GROUP_SIZE:
+                self._write_row_group(partition)
+
+    def _use_partition(self, partition: Tuple[str, int, int]) -> None:
+        """Mark the partition as the most recently used, closing the oldest ones over MAX_OPEN_FILES.
+        Articles of a closed partition that arrive later go to a new file of the same partition"""
+        if partition in self._partitions:
+            self._partitions.move_to_end(partition)
+            return
+
+        self._partitions[partition] = None
+        while len(self._partitions) > self.MAX_OPEN_FILES:
+            self._close_partition(next(iter(self._partitions)))
+
+    def _close_partition(self, partition: Tuple[str, int, int]) -> None:
+        """Write the last row group of the partition and the footer of its file"""
+        self._partitions.pop(partition, None)
+        try:
+            self._write_row_group(partition)
+        finally:
+            writer = self._writers.pop(partition, None)
+            if writer is not None:
+                writer.close()
+                self._files_written += 1
+
+    def _write_row_group(self, partition: Tuple[str, int, int]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = self._rows.pop(partition, [])
+        if len(rows) == 0:
+            return
+
+        writer = self._writers.get(partition)
+        if writer is None:
+            # Hive partitioning, the partition columns are read from the folder names
+            newspaper, year, month = partition
+            partition_path = os.path.join(self.FOLDER_PATH, f"newspaper={newspaper}", f"year={year}", f"month={month:02d}")
+            os.makedirs(partition_path, exist_ok=True)
+
+            file_path = os.path.join(partition_path, f"{self.FILE_PREFIX}-{uuid.uuid4().hex[:8]}.parquet")
+            writer = pq.ParquetWriter(file_path, self._schema, compression="zstd")
+            self._writers[partition] = writer
+
+        writer.write_table(pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self) -> None:
+        """Write the last row groups and the footers of the files. Raises if any of them couldn't be written"""
+        errors = []
+        for partition in list(self._partitions):
+            # A failed partition doesn't leave the other files without their footer
+            try:
+                self._close_partition(partition)
+            except Exception as e:
+                Logger.error("FILE", f"Error closing the parquet file of {partition}: {e}")
+                errors.append(e)
+
+        if self._files_written > 0:
+            Logger.info("FILE", f"Articles exported satisfactorily to {self._files_written} parquet files in {self.FOLDER_PATH}")
+        self._files_written = 0
+
+        if len(errors) > 0:
+            raise errors[0]
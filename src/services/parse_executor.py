@@ -0,0 +1,37 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+
+class ParseExecutor:
+    """Process pool to run the CPU bound parsing of articles outside of the event loop"""
+
+    def __init__(self, max_workers: int = 4):
+        self.MAX_WORKERS = max_workers
+
+        # The pool is created on the first parse, so the workers never create their own pool
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Obtain or create the process pool"""
+        if self._executor is None:
+            # Forking the event loop process (aiohttp resolver and storage writer threads) may deadlock the workers,
+            # they start from a clean process and build their own crawlers
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            mp_context = multiprocessing.get_context(start_method)
+            self._executor = ProcessPoolExecutor(max_workers=self.MAX_WORKERS, mp_context=mp_context)
+
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run the function in a worker without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    async def close(self) -> None:
+        """Shutdown the workers, waiting for them in a thread so the event loop keeps running"""
+        if self._executor is not None:
+            executor = self._executor
+            self._executor = None
+            await asyncio.get_running_loop().run_in_executor(None, lambda: executor.shutdown(wait=True, cancel_futures=True))
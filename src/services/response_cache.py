@@ -0,0 +1,204 @@
+import asyncio
+import json
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.logger import Logger
+
+
+class ResponseCache:
+    """On-disk cache of responses by URL, stored as compressed blobs in SQLite"""
+
+    # URL classes, each one with its own TTL
+    PAGE = "PAGE"
+    ARTICLE = "ARTICLE"
+
+    def __init__(self, db_path: str, ttl_rules: Dict[str, Optional[int]], max_size_mb: int = 1024, commit_every: int = 100):
+        self.DB_PATH = db_path
+        self.TTL_RULES = ttl_rules  # seconds by URL class, None is permanent and 0 is not cached
+        self.MAX_SIZE = max_size_mb * 1024 * 1024
+        self.COMMIT_EVERY = commit_every  # writes by commit, the last ones are committed on close
+
+        # The connection is opened on the first use
+        self._conn: sqlite3.Connection | None = None
+        self._size = 0
+        self._uncommitted = 0
+
+        # The sqlite calls run in order in a dedicated thread, outside the event loop, the only one using the connection
+        self._thread: ThreadPoolExecutor | None = None
+
+    @staticmethod
+    def get_key(url: str, request_kwargs: Dict[str, Any]) -> str:
+        """Key of the response of the url, with the request options (params, headers...) that may change it"""
+        if len(request_kwargs) == 0:
+            return url
+
+        return f"{url} {json.dumps(request_kwargs, sort_keys=True, default=str)}"
+
+    async def _run(self, fn: Callable, *args):
+        """Run a sqlite call in the cache thread"""
+        if self._thread is None:
+            self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="response-cache")
+
+        return await asyncio.get_running_loop().run_in_executor(self._thread, fn, *args)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Obtain or create the connection to the cache database"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.DB_PATH)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT
+                )
+                """
+            )
+            # Cache files created before the validators were stored don't have their columns
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+            for column in ["etag", "last_modified"]:
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        return self._conn
+
+    async def get(self, url: str) -> Optional[str]:
+        """Get the cached body of the url, None if it is missing or expired"""
+        return await self._run(self._get, url)
+
+    async def get_validators(self, url: str) -> Dict[str, str]:
+        """Get the headers to revalidate the cached body of the url, even if it is expired"""
+        return await self._run(self._get_validators, url)
+
+    async def revalidate(self, url: str, url_class: str) -> Optional[str]:
+        """Renew the TTL of the cached body of the url after a 304, None if it is missing"""
+        return await self._run(self._revalidate, url, url_class)
+
+    async def set(self, url: str, text: str, url_class: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store the body of the url, and its validators, with the TTL of its class"""
+        if self.TTL_RULES.get(url_class) == 0:
+            return
+
+        await self._run(self._set, url, text, url_class, etag, last_modified)
+
+    def _get(self, url: str) -> Optional[str]:
+        conn = self._get_connection()
+        row = conn.execute("SELECT body, expires_at FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+
+        body, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            return None
+
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+        self._commit_later()
+
+        return zlib.decompress(body).decode("utf-8")
+
+    def _get_validators(self, url: str) -> Dict[str, str]:
+        conn = self._get_connection()
+        row = conn.execute("SELECT etag, last_modified FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return {}
+
+        etag, last_modified = row
+        headers = {}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+
+        return headers
+
+    def _revalidate(self, url: str, url_class: str) -> Optional[str]:
+        conn = self._get_connection()
+        row = conn.execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+
+        ttl = self.TTL_RULES.get(url_class)
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+
+        conn.execute("UPDATE responses SET expires_at = ?, accessed_at = ? WHERE url = ?", (expires_at, now, url))
+        self._commit_later()
+
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def _set(self, url: str, text: str, url_class: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        ttl = self.TTL_RULES.get(url_class)
+        conn = self._get_connection()
+        body = zlib.compress(text.encode("utf-8"))
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+
+        row = conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            self._size -= row[0]
+
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (url, body, size, stored_at, expires_at, accessed_at, etag, last_modified) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, body, len(body), now, expires_at, now, etag, last_modified),
+        )
+        self._size += len(body)
+
+        self._evict()
+        self._commit_later()
+
+    def _commit_later(self) -> None:
+        """Commit every COMMIT_EVERY writes instead of on each one"""
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_EVERY:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def _evict(self) -> None:
+        """Remove the least recently used responses until the cache fits in its max size"""
+        if self._size <= self.MAX_SIZE:
+            return
+
+        conn = self._get_connection()
+
+        # Free a 10% margin so the eviction doesn't run on every write
+        target_size = self.MAX_SIZE * 0.9
+        evicted_urls = []
+        for url, size in conn.execute("SELECT url, size FROM responses ORDER BY accessed_at ASC"):
+            if self._size <= target_size:
+                break
+            evicted_urls.append((url,))
+            self._size -= size
+
+        conn.executemany("DELETE FROM responses WHERE url = ?", evicted_urls)
+        Logger.info("FILE", f"{len(evicted_urls)} responses evicted from the cache {self.DB_PATH}")
+
+    async def close(self) -> None:
+        """Commit the last writes and close the connection to the cache database"""
+        if self._thread is None:
+            return
+
+        await self._run(self._close)
+        # Nothing left in the thread, it ends without waiting
+        self._thread.shutdown(wait=False)
+        self._thread = None
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+            self._uncommitted = 0
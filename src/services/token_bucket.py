@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket to issue requests continuously at a fixed rate"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.RATE = rate  # tokens per second
+        self.CAPACITY = capacity  # max burst of requests
+
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+        # Waiters take the tokens in arrival order
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.CAPACITY, self._tokens + (now - self._updated_at) * self.RATE)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.RATE)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 
 
 class DateUtils:
@@ -6,3 +7,18 @@ class DateUtils:
     def diff_days(date1: datetime, date2: datetime) -> int:
         diff = date1 - date2
         return diff.days
+
+    @staticmethod
+    def interpolate_position(target_date: datetime, start_position: int, end_position: int, start_date: Optional[datetime], end_date: Optional[datetime]) -> Optional[int]:
+        """Estimate the position of target_date between two positions sorted from the newest to the oldest date"""
+        if start_date is None or end_date is None:
+            return None
+
+        span = (start_date - end_date).total_seconds()
+        if span <= 0:
+            return None
+
+        fraction = (start_date - target_date).total_seconds() / span
+        position = start_position + round(fraction * (end_position - start_position))
+
+        return min(max(position, start_position + 1), end_position - 1)
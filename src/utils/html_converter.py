@@ -0,0 +1,245 @@
+import html
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from bs4.element import AttributeValueWithCharsetSubstitution, Comment, NavigableString, Tag
+from bs4.formatter import Formatter
+from html2text import HTML2Text
+from html2text.utils import pad_tables_in_text
+
+
+class HtmlConverter:
+    # Named entities written by the html formatter, HTMLParser splits the text data at each of them
+    ENTITY_PATTERN = re.compile(r"&([a-zA-Z][a-zA-Z0-9]*);")
+
+    # Elements whose content HTMLParser reads as raw text in some python versions
+    RAW_TEXT_ELEMENTS = {"script", "style", "textarea", "title", "xmp", "iframe", "noembed", "noframes", "noscript", "plaintext"}
+
+    @staticmethod
+    def create_converter() -> HTML2Text:
+        """Create an HTML2Text with the plain text settings of the crawlers"""
+        converter = HTML2Text()
+        converter.ignore_links = True
+        converter.ignore_images = True
+        converter.body_width = 0
+        converter.skip_internal_links = True
+        converter.unicode_snob = True
+
+        # Desactive a Markdown format
+        converter.bold = False
+        converter.italic = False
+        converter.underline = False
+        converter.mark_code = False
+        converter.ignore_emphasis = True
+        converter.single_line_break = True
+
+        return converter
+
+    @staticmethod
+    def convert(converter: HTML2Text, elem: Tag) -> Tuple[str, str]:
+        """Get the text and the html of the contents of elem in a single walk of its tree,
+        the same as converter.handle(elem.decode_contents(formatter="html")) without writing and parsing the html again"""
+        events: List[Tuple[Any, ...]] = []
+        html_pieces = HtmlConverter._walk(converter, elem, events)
+        if html_pieces is None:
+            # Contents HTMLParser reads in its own way, render the html and parse it
+            body_html = elem.decode_contents(formatter="html")
+            return converter.handle(body_html), body_html
+
+        # The calls HTMLParser would make while feeding the html
+        converter.start = True
+        for handler, *args in events:
+            handler(*args)
+
+        text = converter.optwrap(converter.finish())
+        if converter.pad_tables:
+            text = pad_tables_in_text(text)
+
+        return text, "".join(html_pieces)
+
+    @staticmethod
+    def _walk(converter: HTML2Text, elem: Tag, events: List[Tuple[Any, ...]]) -> Optional[List[str]]:
+        """Write the html of the contents like decode_contents, adding the converter calls to events. None if the contents aren't supported"""
+        formatter = elem.formatter_for_name("html")
+        pieces: List[str] = []
+        text: List[str] = []  # adjacent strings, HTMLParser reads them as a single data
+        stack: List[Tag] = []
+
+        for child in elem.descendants:
+            # Close the tags that ended before this element
+            while len(stack) > 0 and child.parent is not stack[-1]:
+                if not HtmlConverter._add_text_events(converter, text, events):
+                    return None
+                name = HtmlConverter._get_name(stack.pop())
+                pieces.append(f"</{name}>")
+                events.append((converter.handle_endtag, name.lower()))
+
+            if isinstance(child, Tag):
+                name = HtmlConverter._get_name(child)
+                if child.hidden or name.lower() in HtmlConverter.RAW_TEXT_ELEMENTS:
+                    return None
+                if not HtmlConverter._add_text_events(converter, text, events):
+                    return None
+
+                attrs_html, attrs = HtmlConverter._get_attributes(child, formatter)
+                if child.is_empty_element:
+                    void_prefix = formatter.void_element_close_prefix or ""
+                    pieces.append(f"<{name}{attrs_html}{void_prefix}>")
+                    events.append((converter.handle_startendtag if void_prefix else converter.handle_starttag, name.lower(), attrs))
+                else:
+                    pieces.append(f"<{name}{attrs_html}>")
+                    events.append((converter.handle_starttag, name.lower(), attrs))
+                    stack.append(child)
+            elif type(child) is NavigableString:
+                piece = child.output_ready(formatter)
+                pieces.append(piece)
+                text.append(piece)
+            elif type(child) is Comment and HtmlConverter._is_plain_comment(child):
+                # Ignored by the converter, but it splits the data around it
+                if not HtmlConverter._add_text_events(converter, text, events):
+                    return None
+                pieces.append(child.output_ready(formatter))
+            else:
+                return None
+
+        while len(stack) > 0:
+            if not HtmlConverter._add_text_events(converter, text, events):
+                return None
+            name = HtmlConverter._get_name(stack.pop())
+            pieces.append(f"</{name}>")
+            events.append((converter.handle_endtag, name.lower()))
+
+        if not HtmlConverter._add_text_events(converter, text, events):
+            return None
+
+        return pieces
+
+    @staticmethod
+    def _add_text_events(converter: HTML2Text, text: List[str], events: List[Tuple[Any, ...]]) -> bool:
+        """Split the pending text like HTMLParser, data between entity references. False if it has other references"""
+        if len(text) == 0:
+            return True
+
+        data = "".join(text)
+        text.clear()
+
+        position = 0
+        for match in HtmlConverter.ENTITY_PATTERN.finditer(data):
+            if match.start() > position:
+                if "&" in data[position : match.start()]:
+                    return False
+                events.append((converter.handle_data, data[position : match.start()]))
+
+            events.append((converter.handle_entityref, match.group(1)))
+            position = match.end()
+
+        if position < len(data):
+            if "&" in data[position:]:
+                return False
+            events.append((converter.handle_data, data[position:]))
+
+        return True
+
+    @staticmethod
+    def _get_attributes(tag: Tag, formatter: Formatter) -> Tuple[str, List[Tuple[str, Optional[str]]]]:
+        """Get the attributes of tag as html, like decode_contents, and as HTMLParser reads them from it"""
+        attrs_html = []
+        attrs = []
+        for key, value in formatter.attributes(tag):
+            if value is None:
+                attrs_html.append(key)
+                attrs.append((key.lower(), None))
+                continue
+
+            if isinstance(value, (list, tuple)):
+                value = " ".join(value)
+            elif not isinstance(value, str):
+                value = str(value)
+            elif isinstance(value, AttributeValueWithCharsetSubstitution):
+                value = value.substitute_encoding("utf-8")
+
+            value_html = formatter.attribute_value(value)
+            attrs_html.append(f"{key}={formatter.quoted_attribute_value(value_html)}")
+            attrs.append((key.lower(), html.unescape(value_html)))
+
+        return (" " + " ".join(attrs_html)) if len(attrs_html) > 0 else "", attrs
+
+    @staticmethod
+    def _get_name(tag: Tag) -> str:
+        return f"{tag.prefix}:{tag.name}" if tag.prefix else tag.name
+
+    @staticmethod
+    def _is_plain_comment(comment: Comment) -> bool:
+        """Comments that end at their own --> in every HTMLParser version"""
+        return "--" not in comment and not comment.startswith((">", "->")) and not comment.endswith("-")
+
+
+class ConverterPool:
+    """Pre-configured HTML2Text instances, each one used by a single caller at a time and reused by the next ones"""
+
+    # Pools shared by the whole process, by process id so a forked worker doesn't use the lock of its parent
+    _pools: Dict[int, "ConverterPool"] = {}
+
+    def __init__(self, create_converter: Callable[[], HTML2Text] = HtmlConverter.create_converter, max_idle: int = 8):
+        self.CREATE_CONVERTER = create_converter
+        self.MAX_IDLE = max_idle  # converters kept for reuse, the extra ones are discarded when returned
+
+        # Idle converters with their state just after being configured
+        self._idle: List[Tuple[HTML2Text, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "ConverterPool":
+        """Get the pool shared by the process, creating it on the first call"""
+        pid = os.getpid()
+        if pid not in cls._pools:
+            cls._pools[pid] = cls()
+
+        return cls._pools[pid]
+
+    @contextmanager
+    def acquire(self) -> Iterator[HTML2Text]:
+        """Lend a converter, it goes back to the pool unless the conversion failed and left it with a half read document"""
+        with self._lock:
+            idle = self._idle.pop() if len(self._idle) > 0 else None
+
+        if idle is None:
+            converter = self.CREATE_CONVERTER()
+            initial_state = self._get_state(converter)
+        else:
+            converter, initial_state = idle
+            self._restore(converter, initial_state)
+
+        yield converter
+
+        with self._lock:
+            if len(self._idle) < self.MAX_IDLE:
+                self._idle.append((converter, initial_state))
+
+    @staticmethod
+    def _get_state(converter: HTML2Text) -> Dict[str, Any]:
+        """Copy of the attributes of a configured converter, the containers apart since they are filled while reading a document"""
+        state = vars(converter)
+        containers = {name: value.copy() for name, value in state.items() if isinstance(value, (list, dict, set))}
+        values = {name: value for name, value in state.items() if name not in containers}
+        return {"values": values, "containers": containers}
+
+    @staticmethod
+    def _restore(converter: HTML2Text, initial_state: Dict[str, Any]) -> None:
+        """Forget what the previous documents left in the converter (lists, links, abbreviations), so the text only depends on its html"""
+        vars(converter).update(initial_state["values"])
+        for name, value in initial_state["containers"].items():
+            setattr(converter, name, value.copy())
+
+    def handle(self, html: str) -> str:
+        """Convert the html to text with a converter of the pool"""
+        with self.acquire() as converter:
+            return converter.handle(html)
+
+    def convert(self, elem: Tag) -> Tuple[str, str]:
+        """Get the text and the html of the contents of elem with a converter of the pool"""
+        with self.acquire() as converter:
+            return HtmlConverter.convert(converter, elem)